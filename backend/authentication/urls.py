@@ -17,4 +17,6 @@ urlpatterns = [
     
     # Perfil do usuário
     path('profile/', views.user_profile_view, name='user_profile'),
+    path('profile/posts/', views.user_posts_view, name='user_posts'),
+    path('profile/mentions/', views.user_mentions_view, name='user_mentions'),
 ] 
\ No newline at end of file
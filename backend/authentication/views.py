@@ -9,6 +9,10 @@ from django.core.exceptions import ValidationError
 import logging
 from .serializers import LoginSerializer, RegisterSerializer, UserSerializer
 from django.conf import settings
+from codeleap_backend.request_logging import log_request
+from posts.models import Mention, Post
+from posts.pagination import paginate, parse_limit, parse_since
+from posts.views import get_timeline_page
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -49,7 +53,7 @@ def login_view(request):
     Retorna tokens JWT para autenticação
     """
     try:
-        logger.info(f"Tentativa de login com dados: {request.data}")
+        log_request(request, 'Tentativa de login')
         
         serializer = LoginSerializer(data=request.data)
         
@@ -189,6 +193,72 @@ def user_profile_view(request):
             'error': str(e) if settings.DEBUG else 'Erro interno'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def user_posts_view(request):
+    """
+    Timeline do usuário autenticado: seus posts, mais recentes primeiro, paginados por cursor
+    """
+    try:
+        limit = parse_limit(request)
+        posts_data, next_cursor = get_timeline_page(
+            Post.objects.filter(user=request.user),
+            request.GET.get('cursor'),
+            limit,
+            request.user,
+        )
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'success': True,
+        'data': posts_data,
+        'next': next_cursor
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def user_mentions_view(request):
+    """
+    Menções ao usuário autenticado, mais recentes primeiro, paginadas por cursor.
+    ?since=<data ISO 8601> traz só as posteriores a essa data (polling incremental)
+    """
+    try:
+        limit = parse_limit(request)
+        since = parse_since(request)
+        # Índice (mentioned_user, created_at); o título do post vem no mesmo SELECT
+        mentions = Mention.objects.filter(mentioned_user=request.user).select_related('post').only(
+            'id', 'created_at', 'post', 'post__title', 'post__username'
+        )
+        if since:
+            mentions = mentions.filter(created_at__gt=since)
+        mentions, next_cursor = paginate(
+            mentions, 'created_at', cursor=request.GET.get('cursor'), limit=limit
+        )
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    mentions_data = [
+        {
+            'id': mention.id,
+            'post_id': mention.post_id,
+            'post_title': mention.post.title,
+            'post_username': mention.post.username,
+            'created_at': mention.created_at,
+        }
+        for mention in mentions
+    ]
+    
+    return Response({
+        'success': True,
+        'data': mentions_data,
+        'next': next_cursor
+    }, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 def verify_token_view(request):
     """
@@ -0,0 +1,71 @@
+"""
+Benchmarks do backend.
+
+Cada módulo roda isolado em um banco de teste descartável:
+
+    python -m benchmarks.mentions
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    """
+    Configura o Django para rodar fora do manage.py
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'codeleap_backend.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Cria um banco de teste (como o test runner faz) e o remove ao final
+    """
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def measure(func, repeat=20, setup=None):
+    """
+    Executa func `repeat` vezes e retorna (mediana, p95) em milissegundos.
+    `setup`, se informado, roda antes de cada execução e fica fora da medição.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95
+
+
+def count_queries(func):
+    """
+    Executa func uma vez e retorna quantas queries SQL foram feitas
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as ctx:
+        func()
+    return len(ctx.captured_queries)
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    line = '  '.join(f'{{:>{width}}}' for width in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
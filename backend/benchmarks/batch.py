@@ -0,0 +1,122 @@
+"""
+/careers/batch/:
+- POST: reenvio de uma fila offline de likes e comentários, uma requisição
+  por operação (toggle_like / comment_list) x uma requisição em lote;
+- GET: atualizar alguns cards recarregando o feed inteiro x ?ids=.
+
+    python -m benchmarks.batch
+"""
+from benchmarks import benchmark_database, count_queries, measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from posts.models import Comment, Like, Post  # noqa: E402
+
+User = get_user_model()
+
+QUEUE_SIZES = (10, 50, 100)
+FEED_POSTS = 1_000
+CARDS = (1, 10, 50)
+
+# Sem cache: o objetivo é medir o banco e o volume transferido
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def replay_queue():
+    with benchmark_database():
+        user = User.objects.create_user(username='mobile')
+        posts = Post.objects.bulk_create([
+            Post(user=user, username='mobile', title=f'Post {i}', content='...')
+            for i in range(max(QUEUE_SIZES))
+        ])
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        def reset():
+            Like.objects.all().delete()
+            Comment.objects.all().delete()
+            Post.objects.update(likes_count=0, comments_count=0)
+
+        rows = []
+        for size in QUEUE_SIZES:
+            # Metade likes, metade comentários, em posts diferentes
+            queue = [
+                {'op': 'like', 'post_id': post.id} if i % 2 else
+                {'op': 'comment', 'post_id': post.id, 'content': f'Comentário {i}'}
+                for i, post in enumerate(posts[:size])
+            ]
+
+            def one_by_one():
+                for operation in queue:
+                    if operation['op'] == 'like':
+                        client.post(f"/careers/{operation['post_id']}/like/")
+                    else:
+                        client.post(
+                            f"/careers/{operation['post_id']}/comments/",
+                            {'content': operation['content']}, content_type='application/json',
+                        )
+
+            def batched():
+                client.post('/careers/batch/', {'operations': queue}, content_type='application/json')
+
+            for name, func, requests in (('uma por operação', one_by_one, size), ('lote', batched, 1)):
+                reset()
+                queries = count_queries(func)
+                median, p95 = measure(func, repeat=5, setup=reset)
+                rows.append((size, name, requests, queries, f'{median:.1f}', f'{p95:.1f}'))
+
+        print_table(('operações', 'estratégia', 'requisições', 'queries', 'mediana ms', 'p95 ms'), rows)
+
+
+def fetch_feed(client):
+    """
+    Recarrega o feed inteiro. Retorna (requisições, bytes)
+    """
+    url, requests, size = '/careers/?limit=100', 0, 0
+    while url:
+        response = client.get(url)
+        requests += 1
+        size += len(response.content)
+        next_cursor = response.json()['next']
+        url = next_cursor and f'/careers/?limit=100&cursor={next_cursor}'
+    return requests, size
+
+
+def hydrate_cards():
+    with override_settings(CACHES=NO_CACHE), benchmark_database():
+        user = User.objects.create_user(username='mobile')
+        posts = Post.objects.bulk_create([
+            Post(user=user, username='mobile', title=f'Post {i}', content='conteúdo ' * 20)
+            for i in range(FEED_POSTS)
+        ])
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        rows = []
+        for cards in CARDS:
+            ids = ','.join(str(post.id) for post in posts[::FEED_POSTS // cards][:cards])
+
+            def by_ids():
+                response = client.get(f'/careers/batch/?ids={ids}')
+                return 1, len(response.content)
+
+            for name, func in (('feed inteiro', lambda: fetch_feed(client)), ('?ids=', by_ids)):
+                requests, size = func()
+                queries = count_queries(func)
+                median, p95 = measure(func, repeat=5)
+                rows.append((cards, name, requests, queries, f'{size / 1024:.0f}', f'{median:.1f}', f'{p95:.1f}'))
+
+        print_table(('cards', 'estratégia', 'requisições', 'queries', 'KB', 'mediana ms', 'p95 ms'), rows)
+
+
+def main():
+    setup_test_environment()
+    replay_queue()
+    hydrate_cards()
+
+
+if __name__ == '__main__':
+    main()
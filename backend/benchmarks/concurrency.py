@@ -0,0 +1,153 @@
+"""
+Requisições por segundo com 50 a 500 clientes simultâneos, comparando o
+deploy WSGI atual (gunicorn, worker sync) com o ASGI (gunicorn + uvicorn).
+Os servidores rodam como subprocessos sobre um SQLite descartável.
+
+    python -m benchmarks.concurrency
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+DATABASE = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+os.environ['SQLITE_PATH'] = DATABASE
+
+from benchmarks import print_table, setup_django  # noqa: E402
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+HOST = '127.0.0.1'
+PORT = 8765
+CONCURRENCY = (50, 100, 250, 500)
+DURATION = 5
+POSTS = 200
+
+SERVERS = (
+    ('wsgi (sync)', ['codeleap_backend.wsgi:application', '--workers', '1']),
+    ('asgi (uvicorn)', [
+        'codeleap_backend.asgi:application', '--workers', '1',
+        '--worker-class', 'uvicorn_worker.UvicornWorker',
+    ]),
+)
+
+
+def seed():
+    call_command('migrate', verbosity=0)
+    users = User.objects.bulk_create([User(username=f'user{i}') for i in range(20)])
+    Post.objects.bulk_create([
+        Post(user=users[i % len(users)], username=users[i % len(users)].username,
+             title=f'Post {i}', content='...')
+        for i in range(POSTS)
+    ])
+    token = RefreshToken.for_user(users[0]).access_token
+    post_id = Post.objects.latest('created_datetime').pk
+    return (
+        ('feed', f'GET /careers/ HTTP/1.1\r\nHost: {HOST}\r\n\r\n'),
+        ('like', f'POST /careers/{post_id}/like/ HTTP/1.1\r\nHost: {HOST}\r\n'
+                 f'Authorization: Bearer {token}\r\nContent-Length: 0\r\n\r\n'),
+    )
+
+
+def start_server(args, **env):
+    env = dict(os.environ, REQUEST_LOG_LEVEL='WARNING', DEBUG='False', **env)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *args, '--bind', f'{HOST}:{PORT}',
+         '--backlog', '2048', '--timeout', '120', '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Servidor não subiu')
+
+
+async def read_response(reader):
+    """
+    Lê uma resposta HTTP/1.1. Retorna (status, conexão pode ser reutilizada)
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(':', 1) for line in lines[1:] if ':' in line)
+    headers = {name.strip().lower(): value.strip().lower() for name, value in headers.items()}
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+        return status, headers.get('connection') != 'close'
+    await reader.read()
+    return status, False
+
+
+async def client(request, deadline, results):
+    writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, PORT)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+            results.append(status)
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError):
+            results.append(None)
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(request, clients):
+    deadline = time.monotonic() + DURATION
+    results = []
+    start = time.monotonic()
+    await asyncio.gather(*(client(request.encode(), deadline, results) for _ in range(clients)))
+    elapsed = time.monotonic() - start
+    ok = sum(1 for status in results if status == 200)
+    return ok / elapsed, len(results) - ok
+
+
+def remove_database():
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(DATABASE + suffix):
+            os.unlink(DATABASE + suffix)
+
+
+def main():
+    try:
+        requests = seed()
+        rows = []
+        for name, args in SERVERS:
+            process = start_server(args)
+            try:
+                for endpoint, request in requests:
+                    for clients in CONCURRENCY:
+                        throughput, errors = asyncio.run(run_load(request, clients))
+                        rows.append((name, endpoint, clients, f'{throughput:.0f}', errors))
+            finally:
+                process.terminate()
+                process.wait()
+        print_table(('servidor', 'endpoint', 'clientes', 'req/s', 'erros'), rows)
+    finally:
+        remove_database()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Carga concorrente nos endpoints do feed e de like, no banco configurado em
+settings.DATABASES (SQLite sem DATABASE_URL, Postgres com ele). No SQLite
+também compara as pragmas de settings com as padrão do SQLite.
+
+    python -m benchmarks.database
+    DATABASE_URL=postgres://... python -m benchmarks.database
+"""
+import random
+import statistics
+import threading
+import time
+
+from benchmarks import benchmark_database, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+THREADS = 8
+REQUESTS_PER_THREAD = 50
+POSTS = 500
+
+# Sem cache: o objetivo é medir o banco
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+# Pragmas padrão do SQLite, para comparação
+SQLITE_DEFAULT_OPTIONS = {'timeout': 20}
+
+
+def run_load(request):
+    """
+    Dispara THREADS threads com REQUESTS_PER_THREAD requisições cada.
+    Retorna (requisições por segundo, mediana ms, p95 ms)
+    """
+    timings = []
+    lock = threading.Lock()
+
+    def worker(seed):
+        client = Client()
+        rng = random.Random(seed)
+        local = []
+        for _ in range(REQUESTS_PER_THREAD):
+            start = time.perf_counter()
+            response = request(client, rng)
+            local.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.status_code
+        connections.close_all()
+        with lock:
+            timings.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return len(timings) / elapsed, statistics.median(timings), p95
+
+
+def scenarios(users, post_ids):
+    headers = [
+        {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        for user in users
+    ]
+
+    def feed(client, rng):
+        return client.get('/careers/', **rng.choice(headers))
+
+    def like(client, rng):
+        return client.post(f'/careers/{rng.choice(post_ids)}/like/', **rng.choice(headers))
+
+    return (('feed', feed), ('like', like))
+
+
+def configurations():
+    options = connection.settings_dict['OPTIONS']
+    if connection.vendor == 'sqlite':
+        # journal_mode é persistente no arquivo e só muda sem outras conexões
+        # abertas: voltar para o padrão aqui, antes de as threads conectarem
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=DELETE')
+        yield 'sqlite (padrão)', SQLITE_DEFAULT_OPTIONS
+        yield 'sqlite (WAL + pragmas)', options
+    else:
+        yield connection.vendor, options
+
+
+def main():
+    setup_test_environment()
+    with override_settings(CACHES=NO_CACHE), benchmark_database():
+        users = User.objects.bulk_create([User(username=f'user{i}') for i in range(THREADS * 4)])
+        Post.objects.bulk_create([
+            Post(user=users[i % len(users)], username=users[i % len(users)].username,
+                 title=f'Post {i}', content='...')
+            for i in range(POSTS)
+        ])
+        post_ids = list(Post.objects.values_list('id', flat=True))
+
+        rows = []
+        for name, options in configurations():
+            # As threads abrem conexões novas com essas OPTIONS
+            connections.settings['default']['OPTIONS'] = options
+            connection.close()
+            connection.ensure_connection()
+            for endpoint, request in scenarios(users, post_ids):
+                throughput, median, p95 = run_load(request)
+                rows.append((name, endpoint, f'{throughput:.0f}', f'{median:.2f}', f'{p95:.2f}'))
+
+        print_table(('banco', 'endpoint', 'req/s', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Mede o gunicorn.conf.py: tempo de subida (até a primeira resposta 200) com
+e sem preload, e requisições/s em regime contra o comando antigo
+(--workers 1, worker sync).
+
+    python -m benchmarks.gunicorn
+"""
+import asyncio
+import time
+import urllib.request
+
+from benchmarks import print_table
+from benchmarks.concurrency import HOST, PORT, remove_database, run_load, seed, start_server
+
+CLIENTS = 100
+OLD_COMMAND = ['codeleap_backend.wsgi:application', '--workers', '1', '--keep-alive', '2']
+CONFIG = ['-c', 'gunicorn.conf.py']
+
+SCENARIOS = (
+    ('antigo (sync, 1 worker)', OLD_COMMAND, {}),
+    ('conf gthread', CONFIG, {'GUNICORN_WORKER': 'gthread'}),
+    ('conf gthread sem preload', CONFIG, {'GUNICORN_WORKER': 'gthread', 'GUNICORN_PRELOAD': 'False'}),
+    ('conf uvicorn', CONFIG, {'GUNICORN_WORKER': 'uvicorn'}),
+)
+
+
+def wait_until_ready(start, timeout=60):
+    """
+    Segundos desde `start` até a primeira resposta 200. Sem preload, o master
+    já aceita conexões antes de os workers carregarem o app
+    """
+    while time.monotonic() - start < timeout:
+        try:
+            with urllib.request.urlopen(f'http://{HOST}:{PORT}/careers/', timeout=5) as response:
+                if response.status == 200:
+                    return time.monotonic() - start
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError('Servidor não respondeu')
+
+
+def main():
+    try:
+        requests = dict(seed())
+        rows = []
+        for name, args, env in SCENARIOS:
+            start = time.monotonic()
+            process = start_server(args, **env)
+            try:
+                startup = wait_until_ready(start)
+                throughput = {
+                    endpoint: asyncio.run(run_load(requests[endpoint], CLIENTS))[0]
+                    for endpoint in ('feed', 'like')
+                }
+            finally:
+                process.terminate()
+                process.wait()
+            rows.append((name, f'{startup:.2f}', f"{throughput['feed']:.0f}", f"{throughput['like']:.0f}"))
+    finally:
+        remove_database()
+
+    print_table(('configuração', 'subida s', 'feed req/s', 'like req/s'), rows)
+
+
+if __name__ == '__main__':
+    main()
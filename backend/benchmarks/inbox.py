@@ -0,0 +1,78 @@
+"""
+Polling das menções de um usuário: percorrer /careers/<id>/mentions/ de cada
+post x a caixa de entrada /auth/profile/mentions/, completa e incremental
+(?since= com a data da menção mais recente já vista).
+
+    python -m benchmarks.inbox
+"""
+from benchmarks import benchmark_database, count_queries, measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from posts.models import Mention, Post  # noqa: E402
+
+User = get_user_model()
+
+POSTS = 200
+# Um post a cada N menciona o usuário
+MENTION_EVERY = 2
+PAGE_SIZE = 50
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def main():
+    setup_test_environment()
+    with override_settings(CACHES=NO_CACHE), benchmark_database():
+        author = User.objects.create_user(username='author')
+        reader = User.objects.create_user(username='reader')
+        posts = Post.objects.bulk_create([
+            Post(user=author, username='author', title=f'Post {i}', content='...')
+            for i in range(POSTS)
+        ])
+        Mention.objects.bulk_create([
+            Mention(post=post, mentioned_user=reader) for post in posts[::MENTION_EVERY]
+        ])
+
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(reader).access_token}')
+        post_ids = [post.id for post in posts]
+        latest = client.get('/auth/profile/mentions/?limit=1').json()['data'][0]['created_at']
+
+        def per_post():
+            for post_id in post_ids:
+                client.get(f'/careers/{post_id}/mentions/?limit={PAGE_SIZE}')
+            return len(post_ids)
+
+        def inbox():
+            url, requests = f'/auth/profile/mentions/?limit={PAGE_SIZE}', 0
+            while url:
+                body = client.get(url).json()
+                requests += 1
+                url = body['next'] and f"/auth/profile/mentions/?limit={PAGE_SIZE}&cursor={body['next']}"
+            return requests
+
+        def incremental():
+            client.get('/auth/profile/mentions/', {'since': latest})
+            return 1
+
+        rows = []
+        for name, func in (
+            ('menções de cada post', per_post),
+            ('caixa de entrada', inbox),
+            ('caixa de entrada ?since=', incremental),
+        ):
+            requests = func()
+            queries = count_queries(func)
+            median, p95 = measure(func, repeat=5)
+            rows.append((name, requests, queries, f'{median:.1f}', f'{p95:.1f}'))
+
+        print_table(('estratégia', 'requisições', 'queries', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compara a resolução de menções antiga (uma query por @username) com a
+versão em lote de posts.mentions.create_mentions.
+
+    python -m benchmarks.mentions
+"""
+from benchmarks import benchmark_database, count_queries, measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+
+from posts.models import Mention, Post  # noqa: E402
+from posts.mentions import create_mentions, extract_mentions  # noqa: E402
+
+User = get_user_model()
+
+
+def create_mentions_per_username(post, content, user):
+    """
+    Implementação anterior, mantida aqui apenas como base de comparação
+    """
+    for username in extract_mentions(content):
+        try:
+            mentioned_user = User.objects.get(username=username)
+            if mentioned_user != user:
+                Mention.objects.get_or_create(post=post, mentioned_user=mentioned_user)
+        except User.DoesNotExist:
+            pass
+
+
+def main():
+    with benchmark_database():
+        author = User.objects.create_user(username='author')
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(200)])
+        post = Post.objects.create(user=author, title='Bench', content='...')
+
+        rows = []
+        for mentions in (1, 10, 30, 100):
+            content = ' '.join(f'@user{i}' for i in range(mentions))
+            for name, func in (
+                ('por username', create_mentions_per_username),
+                ('em lote', create_mentions),
+            ):
+                def run():
+                    func(post, content, author)
+
+                def reset():
+                    Mention.objects.filter(post=post).delete()
+
+                reset()
+                queries = count_queries(run)
+                median, p95 = measure(run, setup=reset)
+                rows.append((mentions, name, queries, f'{median:.2f}', f'{p95:.2f}'))
+
+        print_table(('menções', 'estratégia', 'queries', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Busca textual (posts.search: FTS5 no SQLite, GIN no Postgres) comparada com
+o icontains do PostAdmin.search_fields, com 100k posts. Cada termo aparece
+em uma fração diferente dos posts: quanto mais raro, mais o icontains
+precisa varrer a tabela até encher a página.
+
+    python -m benchmarks.search
+    DATABASE_URL=postgres://... python -m benchmarks.search
+"""
+import random
+
+from benchmarks import benchmark_database, measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from posts import search  # noqa: E402
+from posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+POSTS = 100_000
+BATCH_SIZE = 10_000
+PAGE_SIZE = 20
+WORDS = (
+    'deploy', 'banco', 'cache', 'feed', 'imagem', 'servidor', 'fila', 'índice',
+    'consulta', 'worker', 'memória', 'latência', 'rede', 'disco', 'teste', 'log',
+)
+# Termo -> um post a cada N o contém
+TERMS = {'comum': 10, 'raro': 1_000, 'único': POSTS, 'ausente': None}
+
+
+def seed():
+    rng = random.Random(0)
+    users = User.objects.bulk_create([User(username=f'user{i}') for i in range(50)])
+    for start in range(0, POSTS, BATCH_SIZE):
+        posts = []
+        for i in range(start, start + BATCH_SIZE):
+            words = rng.choices(WORDS, k=30)
+            for term, every in TERMS.items():
+                if every and i % every == every - 1:
+                    words[rng.randrange(len(words))] = term
+            user = users[i % len(users)]
+            posts.append(Post(
+                user=user, username=user.username,
+                title=' '.join(words[:5]), content=' '.join(words[5:]),
+            ))
+        Post.objects.bulk_create(posts)
+    # bulk_create não passa pelos signals
+    search.rebuild_index()
+
+
+def icontains(term):
+    return list(
+        Post.objects.filter(
+            Q(title__icontains=term) | Q(content__icontains=term) | Q(username__icontains=term)
+        ).order_by('-created_datetime', '-id').values_list('id', flat=True)[:PAGE_SIZE]
+    )
+
+
+def full_text(term):
+    return search.search([term], limit=PAGE_SIZE)[0]
+
+
+def main():
+    with benchmark_database():
+        seed()
+
+        rows = []
+        for term in TERMS:
+            for name, func in (('icontains', icontains), ('busca textual', full_text)):
+                results = len(func(term))
+                median, p95 = measure(lambda: func(term), repeat=10)
+                rows.append((term, name, results, f'{median:.2f}', f'{p95:.2f}'))
+
+        print_table(('termo', 'estratégia', 'resultados', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
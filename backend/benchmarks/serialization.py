@@ -0,0 +1,73 @@
+"""
+Tempo de serialização de uma página de 1.000 posts do feed: json.dumps com
+.isoformat() em cada data (como as views faziam), o fallback da biblioteca
+padrão de codeleap_backend.responses e o orjson.
+
+    python -m benchmarks.serialization
+"""
+import datetime
+import json
+
+from benchmarks import measure, print_table, setup_django
+
+setup_django()
+
+from codeleap_backend import responses  # noqa: E402
+
+POSTS = 1000
+
+
+def feed_page():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        'data': [
+            {
+                'id': i,
+                'username': f'user{i % 50}',
+                'created_datetime': now - datetime.timedelta(minutes=i),
+                'title': f'Post {i}',
+                'content': 'Conteúdo do post com @menção e acentuação. ' * 5,
+                'image': f'https://cdn.example.com/posts/{i:02x}/{i}.jpg',
+                'image_thumbnail': f'https://cdn.example.com/posts/{i:02x}/{i}.thumb.webp',
+                'image_webp': None,
+                'image_status': 'ready',
+                'likes_count': i * 3,
+                'comments_count': i % 7,
+                'user_liked': i % 2 == 0,
+            }
+            for i in range(POSTS)
+        ],
+        'next': 'MjAyNS0wOC0yOFQxNzo1MjoxMi4wNDE2OTgrMDA6MDB8MQ==',
+    }
+
+
+def isoformat_then_dumps(page):
+    """
+    Como as views faziam: formatar cada data e depois json.dumps
+    """
+    data = [dict(item, created_datetime=item['created_datetime'].isoformat()) for item in page['data']]
+    return json.dumps({'data': data, 'next': page['next']}).encode('utf-8')
+
+
+def main():
+    page = feed_page()
+    stdlib = json.JSONEncoder(default=responses._default, separators=(',', ':'), ensure_ascii=False)
+
+    strategies = [
+        ('isoformat + json.dumps', lambda: isoformat_then_dumps(page)),
+        ('responses (stdlib)', lambda: stdlib.encode(page).encode('utf-8')),
+        ('streaming (array)', lambda: b''.join(responses.iter_json_array(page['data']))),
+    ]
+    if responses.orjson is not None:
+        strategies.append(('responses (orjson)', lambda: responses.dumps(page)))
+
+    rows = []
+    for name, func in strategies:
+        size = len(func())
+        median, p95 = measure(func, repeat=50)
+        rows.append((name, f'{size / 1024:.0f}', f'{median:.2f}', f'{p95:.2f}'))
+    print_table(('estratégia', 'KB', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compara a latência de upload de imagens entre os backends de posts.storage:
+sistema de arquivos com escrita sequencial e com partes em paralelo, e o
+Cloudinary quando as credenciais estão configuradas.
+
+    python -m benchmarks.storage
+"""
+import os
+import shutil
+import tempfile
+
+from benchmarks import measure, print_table, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+
+from posts.storage import CloudinaryImageStorage, FileSystemImageStorage  # noqa: E402
+
+SIZES_KB = (64, 512, 2048, 5120)
+CHUNK_SIZE = 256 * 1024
+
+
+def backends(location):
+    yield 'filesystem (sequencial)', FileSystemImageStorage(location=location, chunk_size=CHUNK_SIZE, workers=1)
+    yield 'filesystem (4 threads)', FileSystemImageStorage(location=location, chunk_size=CHUNK_SIZE, workers=4)
+    if settings.IMAGE_STORAGE_BACKEND == 'posts.storage.CloudinaryImageStorage':
+        yield 'cloudinary', CloudinaryImageStorage(chunk_size=CHUNK_SIZE)
+
+
+def main():
+    location = tempfile.mkdtemp()
+    rows = []
+    try:
+        for size_kb in SIZES_KB:
+            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as source:
+                source.write(os.urandom(size_kb * 1024))
+
+            for name, backend in backends(location):
+                urls = []
+                # Rede é bem mais lenta que disco: menos repetições para o Cloudinary
+                repeat = 5 if isinstance(backend, CloudinaryImageStorage) else 20
+                median, p95 = measure(lambda: urls.append(backend.save(source.name)), repeat=repeat)
+                for url in urls:
+                    backend.delete(url)
+                rows.append((size_kb, name, f'{median:.2f}', f'{p95:.2f}'))
+
+            os.unlink(source.name)
+    finally:
+        shutil.rmtree(location)
+
+    print_table(('KB', 'backend', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Histórico de posts de um usuário: baixar o feed inteiro e filtrar no cliente
+(como o frontend fazia) x /careers/?user=<username>, que percorre só o
+índice (user, -created_datetime, -id).
+
+    python -m benchmarks.timeline
+"""
+from benchmarks import benchmark_database, measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+POSTS = 20_000
+USERS = 100
+PAGE_SIZE = 100
+
+# Sem cache: o objetivo é medir o banco e o volume transferido
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def fetch_all(client, url):
+    """
+    Percorre todas as páginas a partir de url. Retorna (posts, requisições, bytes)
+    """
+    posts, requests, size = [], 0, 0
+    while url:
+        response = client.get(url)
+        body = response.json()
+        posts += body['data']
+        requests += 1
+        size += len(response.content)
+        url = body['next'] and f"{url.split('&cursor=')[0]}&cursor={body['next']}"
+    return posts, requests, size
+
+
+def main():
+    setup_test_environment()
+    with override_settings(CACHES=NO_CACHE), benchmark_database():
+        users = User.objects.bulk_create([User(username=f'user{i}') for i in range(USERS)])
+        Post.objects.bulk_create([
+            Post(user=users[i % USERS], username=users[i % USERS].username,
+                 title=f'Post {i}', content='conteúdo ' * 20)
+            for i in range(POSTS)
+        ])
+        client = Client()
+
+        def client_side():
+            posts, requests, size = fetch_all(client, f'/careers/?limit={PAGE_SIZE}')
+            return [post for post in posts if post['username'] == 'user7'], requests, size
+
+        def by_user():
+            return fetch_all(client, f'/careers/?user=user7&limit={PAGE_SIZE}')
+
+        rows = []
+        for name, func in (('feed inteiro + filtro', client_side), ('?user=', by_user)):
+            posts, requests, size = func()
+            median, p95 = measure(func, repeat=5)
+            rows.append((name, len(posts), requests, f'{size / 1024:.0f}', f'{median:.1f}', f'{p95:.1f}'))
+
+        print_table(('estratégia', 'posts', 'requisições', 'KB', 'mediana ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'codeleap_backend.settings')
+# Sob ASGI cada requisição faz as queries em uma thread própria, então conexões
+# persistentes não seriam reaproveitadas (e ficariam abertas). No Postgres, o
+# pool do psycopg cobre o reaproveitamento
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
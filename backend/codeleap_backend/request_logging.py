@@ -0,0 +1,119 @@
+"""
+Log estruturado de requisições.
+
+Substitui os logs ad-hoc de request.body/headers: o resumo só é montado se
+o registro passar pelo nível e pela amostragem do logger, nunca lê corpos
+multipart e mascara credenciais. Configurado em settings.LOGGING pelo
+logger 'codeleap.requests'.
+"""
+import json
+import logging
+import random
+
+REQUEST_LOGGER = 'codeleap.requests'
+
+REDACTED = '***'
+SENSITIVE_HEADERS = {'authorization', 'cookie', 'x-csrftoken'}
+SENSITIVE_FIELDS = {'password', 'token', 'access', 'refresh', 'secret', 'api_key'}
+
+# Corpos maiores que isso (ou multipart) não entram no log
+MAX_BODY_PREVIEW = 1024
+
+
+def _redact(data):
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key.lower() in SENSITIVE_FIELDS else _redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact(item) for item in data]
+    return data
+
+
+def _body_preview(request):
+    content_type = request.content_type or ''
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+
+    if not length:
+        return None
+    if 'multipart/form-data' in content_type or length > MAX_BODY_PREVIEW:
+        return f'<{length} bytes omitidos>'
+    if 'application/json' not in content_type:
+        return f'<{length} bytes de {content_type}>'
+
+    try:
+        return _redact(json.loads(request.body))
+    except Exception:
+        # Corpo já consumido (ex.: DRF) ou JSON inválido
+        return f'<{length} bytes>'
+
+
+def summarize_request(request):
+    """
+    Resumo da requisição com headers e campos sensíveis mascarados
+    """
+    return {
+        'method': request.method,
+        'path': request.path,
+        'content_type': request.content_type,
+        'content_length': request.META.get('CONTENT_LENGTH'),
+        'headers': {
+            name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+            for name, value in request.headers.items()
+        },
+        'body': _body_preview(request),
+    }
+
+
+class RequestSummary:
+    """
+    Formata o resumo apenas quando o handler realmente emite o registro
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def __str__(self):
+        return json.dumps(summarize_request(self.request), default=str, ensure_ascii=False)
+
+
+def log_request(request, message, level=logging.INFO):
+    logger = logging.getLogger(REQUEST_LOGGER)
+    if logger.isEnabledFor(level):
+        logger.log(level, '%s %s', message, RequestSummary(request))
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deixa passar apenas uma fração dos registros abaixo de WARNING
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate
+
+
+class TruncateFilter(logging.Filter):
+    """
+    Limita o tamanho da mensagem final do registro
+    """
+
+    def __init__(self, max_length=2000):
+        super().__init__()
+        self.max_length = int(max_length)
+
+    def filter(self, record):
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            record.msg = f'{message[:self.max_length]}... <truncado, {len(message)} caracteres>'
+            record.args = None
+        return True
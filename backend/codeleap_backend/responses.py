@@ -0,0 +1,137 @@
+"""
+Respostas JSON das views escritas à mão.
+
+Serializa com orjson quando instalado (bem mais rápido que o json da
+biblioteca padrão) e cai para o json padrão caso contrário, com a mesma
+saída nos dois casos. Datetimes podem ir direto nos dicts: saem em ISO 8601,
+como o .isoformat().
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_TYPE = 'application/json'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+# Itens serializados por pedaço enviado ao cliente nas respostas em streaming
+STREAM_BATCH_SIZE = 500
+
+
+def _default(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    def dumps(data):
+        """
+        Serializa para bytes JSON
+        """
+        return orjson.dumps(data, default=_default)
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(',', ':'), ensure_ascii=False)
+
+    def dumps(data):
+        """
+        Serializa para bytes JSON
+        """
+        return _encoder.encode(data).encode('utf-8')
+
+
+def json_response(data, status=200, **kwargs):
+    """
+    Substitui HttpResponse(json.dumps(data), content_type='application/json', status=...)
+    """
+    return HttpResponse(dumps(data), content_type=CONTENT_TYPE, status=status, **kwargs)
+
+
+def _batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_json_array(items, batch_size=STREAM_BATCH_SIZE):
+    """
+    Gera um array JSON em pedaços, sem montar a lista inteira em memória
+    """
+    yield b'['
+    first = True
+    for batch in _batches(items, batch_size):
+        chunk = b','.join(dumps(item) for item in batch)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
+
+def iter_ndjson(items, batch_size=STREAM_BATCH_SIZE):
+    """
+    Gera NDJSON (um objeto JSON por linha) em pedaços
+    """
+    for batch in _batches(items, batch_size):
+        yield b''.join(dumps(item) + b'\n' for item in batch)
+
+
+async def _abatches(items, batch_size):
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def aiter_json_array(items, batch_size=STREAM_BATCH_SIZE):
+    """
+    iter_json_array para iteráveis assíncronos (ex.: QuerySet.aiterator())
+    """
+    yield b'['
+    first = True
+    async for batch in _abatches(items, batch_size):
+        chunk = b','.join(dumps(item) for item in batch)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
+
+async def aiter_ndjson(items, batch_size=STREAM_BATCH_SIZE):
+    """
+    iter_ndjson para iteráveis assíncronos
+    """
+    async for batch in _abatches(items, batch_size):
+        yield b''.join(dumps(item) + b'\n' for item in batch)
+
+
+def streaming_json_response(items, ndjson=False, status=200, **kwargs):
+    """
+    Resposta em streaming de uma lista grande (array JSON ou NDJSON).
+    `items` pode ser qualquer iterável, consumido à medida que a resposta é enviada.
+
+    O Django carrega em memória um iterável síncrono servido por ASGI (e um
+    assíncrono servido por WSGI), então use um iterável assíncrono no ASGI e
+    um síncrono no WSGI
+    """
+    if hasattr(items, '__aiter__'):
+        content = aiter_ndjson(items) if ndjson else aiter_json_array(items)
+    else:
+        content = iter_ndjson(items) if ndjson else iter_json_array(items)
+    content_type = NDJSON_CONTENT_TYPE if ndjson else CONTENT_TYPE
+    return StreamingHttpResponse(content, content_type=content_type, status=status, **kwargs)
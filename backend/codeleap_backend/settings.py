@@ -3,6 +3,7 @@ Django settings for codeleap_backend project.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -37,7 +38,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'codeleap_backend.middleware.CORSMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'codeleap_backend.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -67,21 +68,88 @@ TEMPLATES = [
 WSGI_APPLICATION = 'codeleap_backend.wsgi.application'
 
 # Database
+# Conexões persistentes: reaproveitadas entre requisições por até CONN_MAX_AGE segundos,
+# com verificação de saúde antes de reutilizar
+DATABASE_CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', '600'))
+
 if os.getenv('DATABASE_URL'):
     import dj_database_url
+    # Pool de conexões do psycopg 3 (Django >= 5.1). Incompatível com conexões
+    # persistentes: com o pool, cada requisição pega e devolve uma conexão dele
+    DATABASE_POOL = os.getenv('DATABASE_POOL', 'True').lower() == 'true'
     DATABASES = {
         'default': dj_database_url.config(
             default=os.getenv('DATABASE_URL'),
-            conn_max_age=600
+            conn_max_age=0 if DATABASE_POOL else DATABASE_CONN_MAX_AGE,
+            conn_health_checks=True,
         )
     }
+    if DATABASE_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        from psycopg_pool import ConnectionPool
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+            # Segundos esperando uma conexão livre antes de falhar
+            'timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+            # Conexões ociosas além de min_size são fechadas após max_idle segundos
+            'max_idle': int(os.getenv('DATABASE_POOL_MAX_IDLE', '300')),
+            # Health check: testa a conexão antes de entregá-la
+            'check': ConnectionPool.check_connection,
+        }
 else:
+    # Esperar o lock em vez de falhar na hora com escritas concorrentes
+    SQLITE_BUSY_TIMEOUT = 20
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH') or BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': SQLITE_BUSY_TIMEOUT,
+                # Aplicados a cada conexão nova:
+                # - WAL: leitores não bloqueiam o escritor (e vice-versa);
+                # - synchronous=NORMAL: seguro com WAL, sem fsync a cada commit;
+                # - mmap: leituras direto do page cache, sem cópias;
+                # - busy_timeout: igual ao timeout, explícito para conexões fora do Python.
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))};"
+                    f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000};'
+                ),
+                # Transações já começam com o lock de escrita: evita o SQLITE_BUSY
+                # imediato de duas transações tentando promover leitura para escrita
+                'transaction_mode': 'IMMEDIATE',
+            },
+            'TEST': {
+                # Banco em arquivo: o SQLite em memória (shared cache) não suporta
+                # escritas concorrentes de várias threads nos testes
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
+        }
+    }
+
+# Cache
+# O LocMemCache é por processo: com mais de um worker, use REDIS_URL para que a
+# invalidação do cache do feed valha para todos os processos
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
         }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'codeleap',
+        }
+    }
+
+# Tempo (segundos) que páginas do feed ficam em cache
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', '300'))
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -179,12 +247,31 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        # Fração das requisições (abaixo de WARNING) que entra no log
+        'request_sampling': {
+            '()': 'codeleap_backend.request_logging.SamplingFilter',
+            'rate': float(os.getenv('REQUEST_LOG_SAMPLE_RATE', '0.1')),
+        },
+        'truncate': {
+            '()': 'codeleap_backend.request_logging.TruncateFilter',
+            'max_length': int(os.getenv('REQUEST_LOG_MAX_LENGTH', '2000')),
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
     },
+    'loggers': {
+        'codeleap.requests': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'filters': ['request_sampling', 'truncate'],
+            'propagate': False,
+        },
+    },
     'root': {
         'handlers': ['console'],
         'level': 'INFO',
@@ -209,3 +296,43 @@ cloudinary.config(
     api_secret=os.getenv('CLOUDINARY_API_SECRET', ''),
     secure=True
 )
+
+# Armazenamento das imagens (posts.storage)
+# Sem Cloudinary configurado, as imagens só vão para o sistema de arquivos
+# (MEDIA_ROOT) em DEBUG: sem DEBUG o Django não serve /media e as URLs dariam
+# 404, então o upload de imagens fica indisponível (400) até configurar um
+# backend. IMAGE_STORAGE_BACKEND escolhe o backend explicitamente
+if all(os.getenv(name) for name in ('CLOUDINARY_CLOUD_NAME', 'CLOUDINARY_API_KEY', 'CLOUDINARY_API_SECRET')):
+    IMAGE_STORAGE_BACKEND = 'posts.storage.CloudinaryImageStorage'
+elif DEBUG:
+    IMAGE_STORAGE_BACKEND = 'posts.storage.FileSystemImageStorage'
+else:
+    IMAGE_STORAGE_BACKEND = None
+IMAGE_STORAGE_BACKEND = os.getenv('IMAGE_STORAGE_BACKEND') or IMAGE_STORAGE_BACKEND
+IMAGE_STORAGE_OPTIONS = {
+    # URL pública (CDN) na frente do storage; as URLs ficam {IMAGE_CDN_URL}/{chave}
+    'base_url': os.getenv('IMAGE_CDN_URL') or None,
+    'chunk_size': int(os.getenv('IMAGE_STORAGE_CHUNK_SIZE', str(1024 * 1024))),
+    'workers': int(os.getenv('IMAGE_STORAGE_WORKERS', '4')),
+}
+if IMAGE_STORAGE_BACKEND == 'posts.storage.FileSystemImageStorage':
+    # Diretório local ou bucket montado no sistema de arquivos
+    IMAGE_STORAGE_OPTIONS['location'] = os.getenv('IMAGE_STORAGE_LOCATION') or MEDIA_ROOT
+
+# Upload de imagens em segundo plano (posts.uploads)
+IMAGE_UPLOADER = os.getenv('IMAGE_UPLOADER', 'posts.storage.save_image')
+IMAGE_DELETER = os.getenv('IMAGE_DELETER', 'posts.storage.delete_image')
+IMAGE_UPLOAD_WORKERS = int(os.getenv('IMAGE_UPLOAD_WORKERS', '4'))
+# Temporários dos uploads em andamento, e após quanto tempo um upload ainda
+# 'pending' é considerado perdido (python manage.py reap_stale_uploads)
+IMAGE_UPLOAD_SPOOL_DIR = os.getenv('IMAGE_UPLOAD_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'codeleap-uploads')
+IMAGE_UPLOAD_STALE_AFTER = int(os.getenv('IMAGE_UPLOAD_STALE_AFTER', str(15 * 60)))
+
+# Processamento local (resize, miniatura, WebP) antes do upload (posts.image_processing)
+IMAGE_PROCESSING_ENABLED = os.getenv('IMAGE_PROCESSING_ENABLED', 'True').lower() == 'true'
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', '2'))
+
+# Limites do upload de imagens (posts.upload_handlers.BoundedImageUploadHandler)
+MAX_IMAGE_UPLOAD_SIZE = int(os.getenv('MAX_IMAGE_UPLOAD_SIZE', str(5 * 1024 * 1024)))
+# Acima disso o upload vai para arquivo temporário em vez de ficar em memória
+IMAGE_UPLOAD_SPOOL_THRESHOLD = int(os.getenv('IMAGE_UPLOAD_SPOOL_THRESHOLD', str(256 * 1024)))
@@ -0,0 +1,125 @@
+"""
+Configuração do gunicorn:
+
+    gunicorn -c gunicorn.conf.py
+
+Workers e threads são dimensionados pelos CPUs e pela memória disponíveis
+para o container (limites do cgroup, quando houver). O tipo de worker vem de
+GUNICORN_WORKER:
+- 'uvicorn' (ASGI, padrão): as views async (feed, comentários, menções,
+  like, busca, batch) rodam no event loop; as views síncronas vão para o
+  pool de threads do asgiref;
+- 'gthread' (WSGI): cada requisição ocupa uma thread, e as views async
+  passam por async_to_sync (um event loop por requisição), perdendo a
+  vantagem de esperar o banco sem prender a thread. Serve como alternativa
+  quando o uvicorn não estiver disponível no ambiente.
+
+Variáveis de ambiente:
+- WEB_CONCURRENCY: número de workers (sobrepõe o cálculo automático);
+- GUNICORN_WORKER: 'uvicorn' (padrão) ou 'gthread';
+- GUNICORN_THREADS: threads por worker gthread;
+- GUNICORN_WORKER_MEMORY_MB: memória estimada por worker (padrão 150);
+- GUNICORN_PRELOAD: carregar o app antes do fork (padrão True);
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: reciclagem dos workers.
+"""
+import math
+import os
+
+MB = 1024 * 1024
+
+WORKER_CLASSES = {
+    'gthread': ('gthread', 'codeleap_backend.wsgi:application'),
+    'uvicorn': ('uvicorn_worker.UvicornWorker', 'codeleap_backend.asgi:application'),
+}
+
+
+def _read_cgroup(path):
+    try:
+        with open(path) as f:
+            return f.read().split()
+    except OSError:
+        return None
+
+
+def cpu_count():
+    """
+    CPUs utilizáveis: afinidade do processo, limitada pela cota do cgroup v2
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    quota = _read_cgroup('/sys/fs/cgroup/cpu.max')
+    if quota and quota[0] != 'max':
+        cpus = min(cpus, max(1, math.ceil(int(quota[0]) / int(quota[1]))))
+    return cpus or 1
+
+
+def memory_bytes():
+    """
+    Memória disponível: limite do cgroup (v2 ou v1) ou a memória física
+    """
+    physical = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        limit = _read_cgroup(path)
+        if limit and limit[0] != 'max':
+            return min(int(limit[0]), physical)
+    return physical
+
+
+def size_workers(cpus, memory, worker_memory, shared_cache):
+    """
+    Retorna (workers, threads). Workers: 2 * CPUs + 1, limitado pela memória.
+    Sem cache compartilhado (REDIS_URL), o cache do feed é por processo e a
+    invalidação não chegaria aos outros workers: um worker só, e a
+    concorrência fica com as threads
+    """
+    by_memory = max(1, memory // worker_memory)
+    workers = min(2 * cpus + 1, by_memory) if shared_cache else 1
+    # Mesma concorrência total de 2 threads por worker do cálculo por CPU
+    threads = min(16, max(2, math.ceil((2 * cpus + 1) * 2 / workers)))
+    return workers, threads
+
+
+_worker = os.getenv('GUNICORN_WORKER', 'uvicorn')
+if _worker not in WORKER_CLASSES:
+    raise RuntimeError(
+        f"GUNICORN_WORKER inválido: {_worker!r}. "
+        f"Valores aceitos: {', '.join(sorted(WORKER_CLASSES))}"
+    )
+worker_class, wsgi_app = WORKER_CLASSES[_worker]
+
+_workers, _threads = size_workers(
+    cpu_count(),
+    memory_bytes(),
+    int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '150')) * MB,
+    shared_cache=bool(os.getenv('REDIS_URL')),
+)
+workers = int(os.getenv('WEB_CONCURRENCY') or _workers)
+threads = int(os.getenv('GUNICORN_THREADS') or _threads)
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+timeout = 60
+keepalive = 2
+
+# Imports do Django pagos uma vez no master; os workers herdam as páginas (copy-on-write)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+# Recicla cada worker após ~max_requests requisições (contra vazamentos de memória);
+# o jitter evita que todos reiniciem ao mesmo tempo
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+errorlog = '-'
+
+
+def on_starting(server):
+    concurrency = f', {threads} thread(s)' if worker_class == 'gthread' else ''
+    server.log.info(
+        f'{workers} worker(s) {worker_class}{concurrency} '
+        f'({cpu_count()} CPU, {memory_bytes() // MB} MB)'
+    )
+
+
+def post_fork(server, worker):
+    # Com preload, nenhuma conexão aberta no master pode ser compartilhada com os filhos
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
@@ -3,10 +3,10 @@ from .models import Post
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'username', 'user', 'created_datetime', 'id')
+    list_display = ('title', 'username', 'user', 'created_datetime', 'likes_count', 'comments_count', 'id')
     list_filter = ('created_datetime', 'username', 'user')
     search_fields = ('title', 'content', 'username', 'user__username')
-    readonly_fields = ('id', 'created_datetime')
+    readonly_fields = ('id', 'created_datetime', 'likes_count', 'comments_count')
     ordering = ('-created_datetime',)
     
     fieldsets = (
@@ -14,7 +14,7 @@ class PostAdmin(admin.ModelAdmin):
             'fields': ('user', 'username', 'title', 'content')
         }),
         ('Informações do Sistema', {
-            'fields': ('id', 'created_datetime'),
+            'fields': ('id', 'created_datetime', 'likes_count', 'comments_count'),
             'classes': ('collapse',)
         }),
     )
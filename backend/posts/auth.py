@@ -0,0 +1,67 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+jwt_auth = JWTAuthentication()
+
+logger = logging.getLogger(__name__)
+
+def get_user_from_token(request):
+    """
+    Extrai o usuário do token JWT do header Authorization.
+    O resultado é memoizado em request.jwt_user, então o token é validado
+    (e o usuário buscado no banco) no máximo uma vez por requisição.
+    """
+    if not hasattr(request, 'jwt_user'):
+        request.jwt_user = _authenticate_token(request)
+    return request.jwt_user
+
+def _authenticate_token(request):
+    try:
+        # Verificar se há header Authorization
+        auth_header = request.headers.get('Authorization')
+        
+        if not auth_header or not auth_header.startswith('Bearer '):
+            logger.warning("No Authorization header or invalid format")
+            return None
+        
+        # Extrair o token
+        token = auth_header.split(' ')[1]
+        
+        # Validar o token e obter o usuário
+        try:
+            validated_token = jwt_auth.get_validated_token(token)
+            user = jwt_auth.get_user(validated_token)
+            
+            if user and user.is_active:
+                logger.debug(f"User authenticated: {user.username}")
+                return user
+            else:
+                logger.warning("User inactive or invalid")
+                return None
+                
+        except (InvalidToken, TokenError) as e:
+            logger.warning(f"Invalid token: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Token validation error: {str(e)}")
+            return None
+    except Exception as e:
+        logger.error(f"Unexpected error in get_user_from_token: {str(e)}")
+        return None
+
+def get_optional_user(request):
+    """
+    Usuário do token, se a requisição trouxer um. Para endpoints públicos,
+    onde a ausência do header não é um erro
+    """
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    return get_user_from_token(request)
+
+# Versões para views async: a validação do token busca o usuário no banco
+aget_user_from_token = sync_to_async(get_user_from_token)
+aget_optional_user = sync_to_async(get_optional_user)
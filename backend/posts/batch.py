@@ -0,0 +1,159 @@
+"""
+Aplica em lote as operações de like e comentário que clientes móveis
+enfileiram offline, em vez de uma requisição por operação.
+
+Todos os posts são validados em uma query, e likes e comentários são gravados
+com bulk_create / um DELETE só, em uma transação. Como nada disso passa pelos
+signals, os contadores, o cache do feed e o índice de busca são atualizados
+aqui. O resultado é uma lista com um item por operação, na ordem recebida.
+"""
+from django.db import connections, transaction
+from django.db.models import F
+
+from . import cache as feed_cache
+from . import search
+from .mentions import create_mentions_in_bulk
+from .models import Comment, Like, Post
+from .pagination import is_valid_id
+
+MAX_OPERATIONS = 100
+OPERATIONS = ('like', 'unlike', 'comment')
+MAX_COMMENT_LENGTH = Comment._meta.get_field('content').max_length
+
+
+def _error(index, status, message):
+    return {'index': index, 'status': status, 'error': message}
+
+
+def _validate(index, operation):
+    """
+    Retorna a operação normalizada (op, post_id, content) ou o resultado de erro
+    """
+    if not isinstance(operation, dict):
+        return _error(index, 400, 'Operação deve ser um objeto')
+
+    op = operation.get('op')
+    if op not in OPERATIONS:
+        return _error(index, 400, f"Op deve ser {', '.join(OPERATIONS)}")
+
+    post_id = operation.get('post_id')
+    if not isinstance(post_id, int) or isinstance(post_id, bool):
+        return _error(index, 400, 'Post_id deve ser um número inteiro')
+    if not is_valid_id(post_id):
+        return _error(index, 404, 'Post não encontrado')
+
+    content = operation.get('content')
+    if op == 'comment':
+        if not isinstance(content, str) or not content.strip():
+            return _error(index, 400, 'Content é obrigatório')
+        if len(content) > MAX_COMMENT_LENGTH:
+            return _error(index, 400, f'Content deve ter no máximo {MAX_COMMENT_LENGTH} caracteres')
+    return op, post_id, content
+
+
+def _apply_likes(user, wanted):
+    """
+    Deixa os likes do usuário no estado pedido {post_id: curtido}: um
+    bulk_create para os novos e um DELETE para os removidos
+    """
+    liked = set(
+        Like.objects.filter(user=user, post_id__in=wanted).values_list('post_id', flat=True)
+    )
+    # ignore_conflicts: um toggle concorrente pode ter criado o like nesse meio tempo
+    Like.objects.bulk_create(
+        [
+            Like(post_id=post_id, user=user)
+            for post_id, like in wanted.items() if like and post_id not in liked
+        ],
+        ignore_conflicts=True,
+    )
+
+    removed = [post_id for post_id, like in wanted.items() if not like and post_id in liked]
+    if removed:
+        # DELETE direto: o delete() do QuerySet carregaria os likes para disparar os signals
+        connection = connections[Like.objects.db]
+        placeholders = ', '.join(['%s'] * len(removed))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {connection.ops.quote_name(Like._meta.db_table)} '
+                f'WHERE user_id = %s AND post_id IN ({placeholders})',
+                [user.pk, *removed],
+            )
+
+
+def apply_operations(user, operations):
+    """
+    Aplica as operações do usuário e retorna a lista de resultados.
+    Operações inválidas ou de posts inexistentes não impedem as demais
+    """
+    results = [None] * len(operations)
+    valid = []
+    for index, operation in enumerate(operations):
+        validated = _validate(index, operation)
+        if isinstance(validated, dict):
+            results[index] = validated
+        else:
+            valid.append((index, *validated))
+
+    # Todos os posts em uma query
+    existing = set(
+        Post.objects.filter(pk__in={post_id for _, _, post_id, _ in valid}).values_list('id', flat=True)
+    )
+    for index, _, post_id, _ in valid:
+        if post_id not in existing:
+            results[index] = _error(index, 404, 'Post não encontrado')
+    valid = [item for item in valid if item[2] in existing]
+    if not valid:
+        return results
+
+    # Vale o último like/unlike de cada post
+    wanted = {}
+    for _, op, post_id, _ in valid:
+        if op != 'comment':
+            wanted[post_id] = op == 'like'
+
+    comments = [
+        (index, Comment(post_id=post_id, user=user, content=content))
+        for index, op, post_id, content in valid if op == 'comment'
+    ]
+
+    with transaction.atomic():
+        _apply_likes(user, wanted)
+        Comment.objects.bulk_create([comment for _, comment in comments])
+        create_mentions_in_bulk([(comment.post_id, comment.content) for _, comment in comments], user)
+
+        affected = {post_id for _, _, post_id, _ in valid}
+        # Recontagem em um UPDATE, como o reconcile_counters
+        Post.objects.filter(pk__in=affected).with_actual_counts().update(
+            likes_count=F('actual_likes'),
+            comments_count=F('actual_comments'),
+        )
+        search.index_posts({comment.post_id for _, comment in comments})
+
+    for post_id in affected:
+        feed_cache.invalidate_post(post_id)
+
+    likes_count = dict(Post.objects.filter(pk__in=affected).values_list('id', 'likes_count'))
+    for index, op, post_id, _ in valid:
+        if op != 'comment':
+            results[index] = {
+                'index': index,
+                'status': 200,
+                'post_id': post_id,
+                'user_liked': op == 'like',
+                'likes_count': likes_count[post_id],
+            }
+    for index, comment in comments:
+        results[index] = {
+            'index': index,
+            'status': 201,
+            'post_id': comment.post_id,
+            'data': {
+                'id': comment.id,
+                'username': user.username,
+                'content': comment.content,
+                'created_at': comment.created_at,
+                'updated_at': comment.updated_at,
+            },
+        }
+    return results
@@ -0,0 +1,110 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Versões das páginas do feed. Páginas com cursor são ancoradas em um post,
+# então um post novo só muda as páginas sem cursor ("head"); já um post
+# removido pode estar em qualquer página e invalida todas.
+FEED_VERSION_KEY = 'feed:version'
+FEED_HEAD_VERSION_KEY = 'feed:head-version'
+
+
+def _post_key(post_id):
+    return f'feed:post:{post_id}'
+
+
+def _page_key(cursor, limit, versions):
+    if cursor:
+        return f'feed:page:{versions[FEED_VERSION_KEY]}:{cursor}:{limit}'
+    return f'feed:page:{versions[FEED_VERSION_KEY]}:{versions[FEED_HEAD_VERSION_KEY]}:head:{limit}'
+
+
+def _get_versions():
+    keys = [FEED_VERSION_KEY, FEED_HEAD_VERSION_KEY]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns())
+            versions[key] = cache.get(key)
+    return versions
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Chave expirada/removida: recomeçar de um valor que não colide com versões antigas
+        cache.add(key, time.time_ns())
+
+
+def get_page(cursor, limit):
+    """
+    Retorna (chave, página): página é (ids, próximo_cursor) ou None. Num miss,
+    a página calculada deve ser guardada com set_page(chave, ...): a chave usa
+    as versões lidas antes da query, então uma invalidação que chegue durante
+    a query muda a versão e a página antiga nunca é servida
+    """
+    key = _page_key(cursor, limit, _get_versions())
+    return key, cache.get(key)
+
+
+def set_page(key, posts_data, next_cursor):
+    """
+    Guarda a página (apenas ids e cursor) e os dados de cada post separadamente
+    """
+    timeout = settings.FEED_CACHE_TIMEOUT
+    ids = [item['id'] for item in posts_data]
+    cache.set(key, (ids, next_cursor), timeout)
+    set_posts({item['id']: item for item in posts_data})
+
+
+def get_posts(ids):
+    """
+    Retorna {id: dados} dos posts em cache (ids ausentes ficam de fora)
+    """
+    cached = cache.get_many([_post_key(post_id) for post_id in ids])
+    return {item['id']: item for item in cached.values()}
+
+
+def set_posts(posts_by_id):
+    cache.set_many(
+        {_post_key(post_id): item for post_id, item in posts_by_id.items()},
+        settings.FEED_CACHE_TIMEOUT
+    )
+
+
+def _on_commit_too(func):
+    """
+    Invalida agora e de novo após o commit, para que uma leitura concorrente
+    não repopule o cache com dados anteriores à transação
+    """
+    def wrapper(*args):
+        func(*args)
+        transaction.on_commit(lambda: func(*args))
+    return wrapper
+
+
+@_on_commit_too
+def invalidate_post(post_id):
+    """
+    Post editado ou com likes/comentários alterados: só os dados dele mudam
+    """
+    cache.delete(_post_key(post_id))
+
+
+@_on_commit_too
+def invalidate_head():
+    """
+    Post criado: só as páginas sem cursor mudam
+    """
+    _bump(FEED_HEAD_VERSION_KEY)
+
+
+@_on_commit_too
+def invalidate_all():
+    """
+    Post removido: pode estar em qualquer página
+    """
+    _bump(FEED_VERSION_KEY)
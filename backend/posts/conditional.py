@@ -0,0 +1,123 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .auth import get_optional_user
+from .feed import get_feed_page
+from .models import Comment, Mention, Post
+from .pagination import is_valid_id, page_queryset, parse_limit
+
+# Funções de ETag para o decorator acondition (abaixo).
+# Cada uma faz um único SELECT leve (só ids, datas e contadores) sobre as
+# linhas da página pedida; se nada mudou, a view responde 304 sem montar o JSON.
+# O feed anônimo é a exceção: o ETag sai da página do cache do feed.
+
+
+def acondition(etag_func):
+    """
+    Equivalente a condition(etag_func=...) para views async. O condition do
+    Django chama etag_func direto no event loop, e as funções daqui consultam
+    o banco, então aqui ela roda via sync_to_async
+    """
+    aetag_func = sync_to_async(etag_func)
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag = await aetag_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+
+            if etag and request.method in ('GET', 'HEAD'):
+                response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
+
+
+def _digest(*parts):
+    return hashlib.md5(repr(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def _page_etag(request, queryset, field, descending, *columns):
+    if request.method not in ('GET', 'HEAD'):
+        return None
+
+    try:
+        limit = parse_limit(request)
+        queryset = page_queryset(queryset, field, request.GET.get('cursor'), descending)
+    except ValueError:
+        # Parâmetros inválidos: a própria view responde 400
+        return None
+
+    # limit + 1 para que o ETag também reflita a existência da próxima página
+    rows = list(queryset.values_list(*columns)[:limit + 1])
+    if not rows:
+        return None
+    return _digest(limit, rows)
+
+
+def feed_etag(request):
+    user = get_optional_user(request) if request.method in ('GET', 'HEAD') else None
+    if user is None and not request.GET.get('user') and request.method in ('GET', 'HEAD'):
+        return _anonymous_feed_etag(request)
+    queryset = Post.objects.with_user_liked(user)
+    if request.GET.get('user'):
+        queryset = queryset.by_author(request.GET['user'])
+    return _page_etag(
+        request,
+        queryset,
+        'created_datetime',
+        True,
+        'id', 'updated_at', 'likes_count', 'comments_count', 'user_liked',
+    )
+
+
+def _anonymous_feed_etag(request):
+    """
+    O feed anônimo é igual para todos e fica no cache do feed: o ETag vem da
+    própria página (ids e dados dos posts em cache, invalidados pelos
+    signals), e um cache hit não toca o banco. A página fica em
+    request.feed_page para a view não buscá-la de novo
+    """
+    try:
+        limit = parse_limit(request)
+        request.feed_page = get_feed_page(request.GET.get('cursor'), limit)
+    except ValueError:
+        return None
+
+    posts_data, next_cursor = request.feed_page
+    if not posts_data:
+        return None
+    return _digest(limit, posts_data, next_cursor)
+
+
+def comments_etag(request, pk):
+    # Id fora da faixa do banco estouraria no filtro; sem ETag, a view responde 404
+    if not is_valid_id(pk):
+        return None
+    return _page_etag(
+        request,
+        Comment.objects.filter(post_id=pk),
+        'created_at',
+        False,
+        'id', 'updated_at',
+    )
+
+
+def mentions_etag(request, pk):
+    if not is_valid_id(pk):
+        return None
+    return _page_etag(
+        request,
+        Mention.objects.filter(post_id=pk),
+        'created_at',
+        False,
+        'id',
+    )
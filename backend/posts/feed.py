@@ -0,0 +1,84 @@
+"""
+Páginas do feed (GET /careers/), usadas pela view e pelo ETag do feed
+"""
+from . import cache as feed_cache
+from .models import Like, Post
+from .pagination import paginate
+
+
+def post_to_dict(post):
+    """
+    Dados públicos de um post no feed (iguais para todos os usuários)
+    """
+    return {
+        'id': post.id,
+        'username': post.username,
+        'created_datetime': post.created_datetime,
+        'title': post.title,
+        'content': post.content,
+        'image': post.image if post.image else None,
+        'image_thumbnail': post.image_thumbnail,
+        'image_webp': post.image_webp,
+        'image_status': post.image_status,
+        'likes_count': post.likes_count,
+        'comments_count': post.comments_count,
+    }
+
+
+def get_feed_page(cursor, limit, user=None):
+    """
+    Retorna (posts_data, próximo_cursor) de uma página do feed.
+    A página é compartilhada em cache entre todos os usuários; apenas o
+    user_liked de quem está logado é sobreposto a cada requisição.
+    """
+    key, page = feed_cache.get_page(cursor, limit)
+
+    if page is None:
+        posts, next_cursor = paginate(
+            Post.objects.with_user_liked(user),
+            'created_datetime',
+            cursor=cursor,
+            limit=limit,
+        )
+        shared = [post_to_dict(post) for post in posts]
+        feed_cache.set_page(key, shared, next_cursor)
+        posts_data = [
+            dict(item, user_liked=post.user_liked)
+            for item, post in zip(shared, posts)
+        ]
+        return posts_data, next_cursor
+
+    ids, next_cursor = page
+    cached = feed_cache.get_posts(ids)
+    missing = [post_id for post_id in ids if post_id not in cached]
+    if missing:
+        fresh = {post.id: post_to_dict(post) for post in Post.objects.filter(pk__in=missing)}
+        feed_cache.set_posts(fresh)
+        cached.update(fresh)
+
+    liked = set()
+    if user is not None:
+        liked = set(
+            Like.objects.filter(user=user, post_id__in=ids).values_list('post_id', flat=True)
+        )
+
+    posts_data = [
+        dict(cached[post_id], user_liked=post_id in liked)
+        for post_id in ids if post_id in cached
+    ]
+    return posts_data, next_cursor
+
+
+def get_timeline_page(queryset, cursor, limit, user=None):
+    """
+    Retorna (posts_data, próximo_cursor) de uma página de um recorte do feed
+    (ex.: os posts de um usuário), direto do banco, sem o cache do feed
+    """
+    posts, next_cursor = paginate(
+        queryset.with_user_liked(user),
+        'created_datetime',
+        cursor=cursor,
+        limit=limit,
+    )
+    posts_data = [dict(post_to_dict(post), user_liked=post.user_liked) for post in posts]
+    return posts_data, next_cursor
@@ -0,0 +1,76 @@
+"""
+Processamento local das imagens dos posts com Pillow.
+
+As funções daqui rodam em um pool de processos (posts.uploads), então não
+importam nada do Django: recebem e devolvem apenas caminhos de arquivos.
+"""
+import os
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow é opcional: sem ele, a imagem é enviada sem processamento
+    Image = None
+
+# Mesmo limite que era aplicado remotamente pela transformation do Cloudinary
+MAX_SIZE = (800, 600)
+THUMBNAIL_SIZE = (200, 200)
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+
+def is_available():
+    return Image is not None
+
+
+def _save(image, path, image_format, **options):
+    # Sem info/exif: metadados (EXIF, GPS, perfis) não vão para os arquivos gerados
+    image.info = {}
+    image.save(path, image_format, **options)
+    return path
+
+
+def process_image(path):
+    """
+    Decodifica a imagem uma única vez e gera as variantes:
+
+    - image: orientação do EXIF aplicada, reduzida para caber em MAX_SIZE,
+      no formato original (PNG/GIF viram PNG, o resto JPEG);
+    - webp: a mesma imagem em WebP;
+    - thumbnail: miniatura em WebP, para o feed.
+
+    Retorna {variante: caminho} de arquivos novos, ao lado do original.
+    """
+    base = os.path.splitext(path)[0]
+    created = []
+
+    def save(image, suffix, image_format, **options):
+        created.append(_save(image, f'{base}{suffix}', image_format, **options))
+        return created[-1]
+
+    try:
+        with Image.open(path) as original:
+            source_format = original.format
+            image = ImageOps.exif_transpose(original)
+            image.load()
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        image.thumbnail(MAX_SIZE, Image.LANCZOS)
+
+        if source_format in ('PNG', 'GIF'):
+            full = save(image.copy(), '.full.png', 'PNG', optimize=True)
+        else:
+            full = save(image.convert('RGB'), '.full.jpg', 'JPEG', quality=JPEG_QUALITY, optimize=True)
+
+        webp = save(image.copy(), '.full.webp', 'WEBP', quality=WEBP_QUALITY)
+
+        thumbnail = image.copy()
+        thumbnail.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+        thumbnail = save(thumbnail, '.thumb.webp', 'WEBP', quality=WEBP_QUALITY)
+    except Exception:
+        # Imagem inválida/corrompida: não deixar variantes pela metade no disco
+        for created_path in created:
+            os.unlink(created_path)
+        raise
+
+    return {'image': full, 'webp': webp, 'thumbnail': thumbnail}
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Recupera uploads de imagem presos em 'pending' (worker reciclado, morto ou "
+        'com timeout) e remove os arquivos temporários que ficaram para trás'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=settings.IMAGE_UPLOAD_STALE_AFTER,
+            help='Segundos em pending para considerar o upload perdido (padrão: IMAGE_UPLOAD_STALE_AFTER)',
+        )
+        parser.add_argument(
+            '--retry',
+            action='store_true',
+            help="Refaz o upload se o arquivo temporário ainda existir, em vez de marcar 'failed'",
+        )
+
+    def handle(self, *args, **options):
+        retried, failed, removed = uploads.reap_stale_uploads(
+            timedelta(seconds=options['older_than']), retry=options['retry']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{retried} upload(s) reenviado(s), {failed} marcado(s) como falho(s), '
+            f'{removed} arquivo(s) órfão(s) removido(s)'
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from posts import search
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca textual (FTS5 no SQLite; no Postgres o índice é do banco)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Banco a reindexar (padrão: default)',
+        )
+
+    def handle(self, *args, **options):
+        indexed = search.rebuild_index(options['database'])
+        self.stdout.write(self.style.SUCCESS(f'{indexed} post(s) indexado(s)'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from posts import cache as feed_cache
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Reconcilia os contadores desnormalizados (likes_count/comments_count) dos posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas informa quantos posts estão divergentes, sem corrigir',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Post.objects.with_actual_counts().filter(
+            ~Q(likes_count=F('actual_likes')) | ~Q(comments_count=F('actual_comments'))
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted.count()} post(s) com contadores divergentes')
+            return
+
+        # Um único UPDATE em massa, sem carregar os posts em memória
+        updated = drifted.update(
+            likes_count=F('actual_likes'),
+            comments_count=F('actual_comments'),
+        )
+        if updated:
+            # update() não dispara signals: as páginas em cache têm os contadores antigos
+            feed_cache.invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f'{updated} post(s) reconciliado(s)'))
@@ -0,0 +1,61 @@
+"""
+Menções (@username) em posts e comentários
+"""
+import logging
+import re
+
+from django.contrib.auth import get_user_model
+
+from .models import Mention
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+MENTION_PATTERN = re.compile(r'@(\w+)')
+
+
+def extract_mentions(content):
+    """
+    Extrai menções (@username) do conteúdo, sem duplicatas e na ordem em que aparecem
+    """
+    return list(dict.fromkeys(MENTION_PATTERN.findall(content)))
+
+
+def create_mentions(post, content, user):
+    """
+    Cria menções para usuários mencionados no conteúdo.
+    Usa uma query para resolver todos os usernames e um bulk_create,
+    independente de quantas menções o conteúdo tenha.
+    """
+    create_mentions_in_bulk([(post.pk, content)], user)
+
+
+def create_mentions_in_bulk(contents, user):
+    """
+    create_mentions para vários conteúdos [(post_id, content), ...] de uma vez:
+    ainda uma query para os usernames e um bulk_create
+    """
+    usernames_by_post = [(post_id, extract_mentions(content)) for post_id, content in contents]
+    usernames = {username for _, names in usernames_by_post for username in names}
+    if not usernames:
+        return
+    
+    mentioned_users = dict(
+        User.objects.filter(username__in=usernames).values_list('username', 'pk')
+    )
+    
+    missing = sorted(usernames - mentioned_users.keys())
+    if missing:
+        logger.warning(f"Users not found for mention: {', '.join(missing)}")
+    
+    Mention.objects.bulk_create(
+        [
+            Mention(post_id=post_id, mentioned_user_id=mentioned_users[username])
+            for post_id, names in usernames_by_post
+            for username in names
+            if username in mentioned_users
+            and mentioned_users[username] != user.pk  # Não mencionar a si mesmo
+        ],
+        ignore_conflicts=True
+    )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:14
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('posts', 'Like')
+    Comment = apps.get_model('posts', 'Comment')
+
+    # Um único UPDATE com subqueries em vez de contar post a post
+    likes = (
+        Like.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post').annotate(total=Count('*')).values('total')
+    )
+    comments = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post').annotate(total=Count('*')).values('total')
+    )
+    Post.objects.update(
+        likes_count=Coalesce(Subquery(likes, output_field=IntegerField()), 0),
+        comments_count=Coalesce(Subquery(comments, output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_alter_post_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, help_text='Contador desnormalizado de comentários (mantido pelos signals)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, help_text='Contador desnormalizado de likes (mantido pelos signals)'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
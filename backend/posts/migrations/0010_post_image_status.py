@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:21
+
+from django.db import migrations, models
+
+
+def mark_existing_images_ready(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.exclude(image__isnull=True).exclude(image='').update(image_status='ready')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_status',
+            field=models.CharField(choices=[('none', 'Sem imagem'), ('pending', 'Upload pendente'), ('ready', 'Pronta'), ('failed', 'Falha no upload')], default='none', help_text='Estado do upload da imagem, feito em segundo plano', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_images_ready, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_image_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(help_text='sha256 do conteúdo da imagem', max_length=64, unique=True)),
+                ('url', models.URLField(help_text='URL da imagem no host', max_length=500)),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Quantidade de posts usando a imagem')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Stored image',
+                'verbose_name_plural': 'Stored images',
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='stored_image',
+            field=models.ForeignKey(blank=True, help_text='Imagem deduplicada (por conteúdo) usada pelo post', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='posts.storedimage'),
+        ),
+    ]
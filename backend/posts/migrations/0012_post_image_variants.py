@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_storedimage_post_stored_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_thumbnail',
+            field=models.URLField(blank=True, help_text='URL da miniatura da imagem, usada no feed', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_webp',
+            field=models.URLField(blank=True, help_text='URL da imagem em WebP', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='storedimage',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, help_text='URL da miniatura no host', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='storedimage',
+            name='webp_url',
+            field=models.URLField(blank=True, help_text='URL da variante WebP no host', max_length=500, null=True),
+        ),
+    ]
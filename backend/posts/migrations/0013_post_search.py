@@ -0,0 +1,53 @@
+from django.db import migrations
+
+# Mesmas expressões de posts.search: o Postgres só usa um índice de expressão
+# quando a query repete a expressão indexada
+POSTGRES_INDEXES = (
+    "CREATE INDEX posts_post_search_idx ON posts_post USING gin (("
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', content), 'B') || "
+    "setweight(to_tsvector('simple', username), 'C')))",
+    "CREATE INDEX posts_comment_search_idx ON posts_comment "
+    "USING gin ((to_tsvector('simple', content)))",
+)
+
+SQLITE_TABLE = (
+    "CREATE VIRTUAL TABLE posts_search USING fts5("
+    "title, content, username, comments, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SQLITE_POPULATE = (
+    "INSERT INTO posts_search (rowid, title, content, username, comments) "
+    "SELECT p.id, p.title, p.content, p.username, "
+    "(SELECT group_concat(c.content, ' ') FROM posts_comment c WHERE c.post_id = p.id) "
+    "FROM posts_post p"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in POSTGRES_INDEXES:
+            schema_editor.execute(sql)
+    elif vendor == 'sqlite':
+        schema_editor.execute(SQLITE_TABLE)
+        schema_editor.execute(SQLITE_POPULATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS posts_comment_search_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS posts_post_search_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS posts_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# Busca sem acentos no Postgres, como o remove_diacritics do FTS5. unaccent()
+# não é IMMUTABLE (depende do search_path), então não pode entrar em índice:
+# posts_unaccent fixa o dicionário e pode. Mesmas expressões de posts.search
+POSTGRES_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION posts_unaccent(text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+    "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+)
+POSTGRES_INDEXES = (
+    "CREATE INDEX posts_post_search_idx ON posts_post USING gin (("
+    "setweight(to_tsvector('simple', posts_unaccent(title)), 'A') || "
+    "setweight(to_tsvector('simple', posts_unaccent(content)), 'B') || "
+    "setweight(to_tsvector('simple', posts_unaccent(username)), 'C')))",
+    "CREATE INDEX posts_comment_search_idx ON posts_comment "
+    "USING gin ((to_tsvector('simple', posts_unaccent(content))))",
+)
+# Índices da 0013, para reverter
+PREVIOUS_INDEXES = (
+    "CREATE INDEX posts_post_search_idx ON posts_post USING gin (("
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', content), 'B') || "
+    "setweight(to_tsvector('simple', username), 'C')))",
+    "CREATE INDEX posts_comment_search_idx ON posts_comment "
+    "USING gin ((to_tsvector('simple', content)))",
+)
+DROP_INDEXES = (
+    'DROP INDEX IF EXISTS posts_comment_search_idx',
+    'DROP INDEX IF EXISTS posts_post_search_idx',
+)
+
+
+def add_unaccent(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # unaccent é uma extensão "trusted" (Postgres 13+): não exige superusuário
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA public')
+    schema_editor.execute(POSTGRES_FUNCTION)
+    for sql in DROP_INDEXES + POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+
+
+def remove_unaccent(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_INDEXES + PREVIOUS_INDEXES:
+        schema_editor.execute(sql)
+    schema_editor.execute('DROP FUNCTION IF EXISTS posts_unaccent(text)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_user_timeline_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_unaccent, remove_unaccent),
+    ]
@@ -1,7 +1,57 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
+from django.utils import timezone
+
+class PostQuerySet(models.QuerySet):
+    def with_user_liked(self, user=None):
+        """
+        Anota user_liked (se o usuário deu like) na mesma query do feed,
+        evitando uma consulta por post (N+1)
+        """
+        if user is not None and user.is_authenticated:
+            user_liked = Exists(Like.objects.filter(post=OuterRef('pk'), user=user))
+        else:
+            user_liked = Value(False)
+        return self.annotate(user_liked=user_liked)
+
+    def by_author(self, username):
+        """
+        Posts de um usuário, pelo username da conta (não o username exibido no post)
+        """
+        return self.filter(user__username=username)
+
+    def with_actual_counts(self):
+        """
+        Anota as contagens reais de likes/comentários (actual_likes, actual_comments),
+        usadas para reconciliar os contadores desnormalizados
+        """
+        likes = (
+            Like.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post').annotate(total=Count('*')).values('total')
+        )
+        comments = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post').annotate(total=Count('*')).values('total')
+        )
+        return self.annotate(
+            actual_likes=Coalesce(Subquery(likes, output_field=IntegerField()), 0),
+            actual_comments=Coalesce(Subquery(comments, output_field=IntegerField()), 0),
+        )
 
 class Post(models.Model):
+    IMAGE_NONE = 'none'
+    IMAGE_PENDING = 'pending'
+    IMAGE_READY = 'ready'
+    IMAGE_FAILED = 'failed'
+    IMAGE_STATUS_CHOICES = [
+        (IMAGE_NONE, 'Sem imagem'),
+        (IMAGE_PENDING, 'Upload pendente'),
+        (IMAGE_READY, 'Pronta'),
+        (IMAGE_FAILED, 'Falha no upload'),
+    ]
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -15,6 +65,7 @@ class Post(models.Model):
         help_text="Username para exibição (mantido para compatibilidade)"
     )
     created_datetime = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=200)
     content = models.TextField()
     image = models.URLField(
@@ -23,6 +74,42 @@ class Post(models.Model):
         blank=True,
         help_text="URL da imagem do post (Cloudinary)"
     )
+    image_thumbnail = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        help_text="URL da miniatura da imagem, usada no feed"
+    )
+    image_webp = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        help_text="URL da imagem em WebP"
+    )
+    stored_image = models.ForeignKey(
+        'StoredImage',
+        on_delete=models.SET_NULL,
+        related_name='posts',
+        null=True,
+        blank=True,
+        help_text="Imagem deduplicada (por conteúdo) usada pelo post"
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_NONE,
+        help_text="Estado do upload da imagem, feito em segundo plano"
+    )
+    likes_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Contador desnormalizado de likes (mantido pelos signals)"
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Contador desnormalizado de comentários (mantido pelos signals)"
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_datetime']  # Mais recente primeiro
@@ -30,7 +117,8 @@ class Post(models.Model):
         verbose_name_plural = "Posts"
         indexes = [
             models.Index(fields=['-created_datetime']),
-            models.Index(fields=['user']),
+            # Timeline de um usuário: range scan já na ordem da paginação por cursor
+            models.Index(fields=['user', '-created_datetime', '-id'], name='post_user_timeline_idx'),
             models.Index(fields=['username']),
         ]
 
@@ -47,13 +135,53 @@ class Post(models.Model):
                 self.username = "Anonymous"
         super().save(*args, **kwargs)
 
-    @property
-    def likes_count(self):
-        return self.likes.count()
-    
-    @property
-    def comments_count(self):
-        return self.comments.count()
+class LikeQuerySet(models.QuerySet):
+    def toggle(self, post_id, user_id):
+        """
+        Alterna o like de forma atômica e retorna (liked, likes_count).
+
+        Tenta primeiro o DELETE; se nenhuma linha for removida, faz
+        INSERT ... ON CONFLICT DO NOTHING. Como a decisão vem do rowcount
+        do próprio banco, dois toggles simultâneos nunca violam o
+        unique_together nem contam o mesmo like duas vezes. O contador do
+        post é ajustado na mesma transação (sem passar pelos signals).
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        like_table = qn(Like._meta.db_table)
+        post_table = qn(Post._meta.db_table)
+
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {like_table} WHERE post_id = %s AND user_id = %s',
+                [post_id, user_id],
+            )
+            if cursor.rowcount:
+                liked, delta = False, -1
+            else:
+                cursor.execute(
+                    f'INSERT INTO {like_table} (post_id, user_id, created_at) VALUES (%s, %s, %s) '
+                    f'ON CONFLICT (post_id, user_id) DO NOTHING',
+                    [post_id, user_id, connection.ops.adapt_datetimefield_value(timezone.now())],
+                )
+                # rowcount 0: outra requisição concorrente já criou o like
+                liked, delta = True, cursor.rowcount
+
+            if delta and connection.features.can_return_columns_from_insert:
+                cursor.execute(
+                    f'UPDATE {post_table} SET likes_count = '
+                    f'CASE WHEN likes_count + %s < 0 THEN 0 ELSE likes_count + %s END '
+                    f'WHERE id = %s RETURNING likes_count',
+                    [delta, delta, post_id],
+                )
+                return liked, cursor.fetchone()[0]
+
+            if delta:
+                Post.objects.using(self.db).filter(pk=post_id).update(
+                    likes_count=Greatest(F('likes_count') + delta, 0)
+                )
+            likes_count = Post.objects.using(self.db).values_list('likes_count', flat=True).get(pk=post_id)
+            return liked, likes_count
 
 class Like(models.Model):
     post = models.ForeignKey(
@@ -70,6 +198,8 @@ class Like(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LikeQuerySet.as_manager()
+
     class Meta:
         unique_together = ['post', 'user']  # Um usuário só pode dar like uma vez por post
         verbose_name = "Like"
@@ -137,3 +267,54 @@ class Mention(models.Model):
 
     def __str__(self):
         return f"Menção de {self.mentioned_user.username} em {self.post.title}"
+
+class StoredImageQuerySet(models.QuerySet):
+    def acquire(self, digest):
+        """
+        Incrementa a contagem de referências da imagem com esse digest e a retorna,
+        ou None se ela ainda não foi enviada ao host
+        """
+        with transaction.atomic(using=self.db):
+            if not self.filter(digest=digest).update(ref_count=F('ref_count') + 1):
+                return None
+            return self.get(digest=digest)
+
+    def release(self, pk):
+        """
+        Decrementa a contagem de referências. Se chegar a zero, remove o registro
+        e retorna a imagem removida (para apagar o arquivo do host); senão None
+        """
+        with transaction.atomic(using=self.db):
+            self.filter(pk=pk, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+            orphan = self.select_for_update().filter(pk=pk, ref_count=0).first()
+            if orphan is not None:
+                orphan.delete()
+            return orphan
+
+class StoredImage(models.Model):
+    """
+    Índice de imagens por conteúdo (sha256): a mesma imagem postada de novo
+    reutiliza a URL já enviada, sem novo upload
+    """
+    digest = models.CharField(max_length=64, unique=True, help_text="sha256 do conteúdo da imagem")
+    url = models.URLField(max_length=500, help_text="URL da imagem no host")
+    thumbnail_url = models.URLField(max_length=500, null=True, blank=True, help_text="URL da miniatura no host")
+    webp_url = models.URLField(max_length=500, null=True, blank=True, help_text="URL da variante WebP no host")
+    ref_count = models.PositiveIntegerField(default=0, help_text="Quantidade de posts usando a imagem")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = StoredImageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Stored image"
+        verbose_name_plural = "Stored images"
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.ref_count} refs)"
+
+    @property
+    def urls(self):
+        """
+        URLs de todas as variantes enviadas ao host
+        """
+        return [url for url in (self.url, self.thumbnail_url, self.webp_url) if url]
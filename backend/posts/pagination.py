@@ -0,0 +1,148 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Faixa positiva do BigAutoField: fora dela o banco estoura (OverflowError) em vez de não achar nada
+MAX_ID = 2 ** 63 - 1
+
+
+def is_valid_id(value):
+    return 1 <= value <= MAX_ID
+
+
+def encode_cursor(value, pk):
+    """
+    Codifica a posição (datetime, id) do último item da página em um cursor opaco
+    """
+    raw = f"{value.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por encode_cursor. Levanta ValueError se for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        value, pk = raw.rsplit('|', 1)
+        parsed = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Cursor inválido')
+
+    if parsed is None or not is_valid_id(pk):
+        raise ValueError('Cursor inválido')
+    return parsed, pk
+
+
+def parse_limit(request, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Lê o parâmetro ?limit= da query string, limitado a `maximum`
+    """
+    limit = request.GET.get('limit')
+    if limit in (None, ''):
+        return default
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('Limit deve ser um número inteiro')
+
+    if limit < 1:
+        raise ValueError('Limit deve ser maior que zero')
+    return min(limit, maximum)
+
+
+def parse_ids(request, maximum=MAX_PAGE_SIZE):
+    """
+    Lê o parâmetro ?ids=1,2,3 da query string: ids sem repetição, na ordem pedida
+    """
+    raw = request.GET.get('ids', '')
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw.split(',') if value.strip()))
+    except ValueError:
+        raise ValueError('Ids deve ser uma lista de números inteiros separados por vírgula')
+
+    if not ids:
+        raise ValueError('Informe os ids dos posts')
+    if not all(is_valid_id(value) for value in ids):
+        raise ValueError(f'Ids devem estar entre 1 e {MAX_ID}')
+    if len(ids) > maximum:
+        raise ValueError(f'Máximo de {maximum} ids por requisição')
+    return ids
+
+
+def parse_since(request):
+    """
+    Lê o parâmetro ?since= (data ISO 8601) da query string. Sem fuso, usa o do projeto
+    """
+    since = request.GET.get('since')
+    if since in (None, ''):
+        return None
+
+    try:
+        parsed = parse_datetime(since)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError('Since deve ser uma data ISO 8601')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def page_queryset(queryset, field, cursor=None, descending=True):
+    """
+    Ordena por (field, id) e filtra a partir do cursor, sem OFFSET
+    """
+    if descending:
+        queryset = queryset.order_by(f'-{field}', '-id')
+    else:
+        queryset = queryset.order_by(field, 'id')
+
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        op = 'lt' if descending else 'gt'
+        # O limite em field (lte/gte) vem na frente do OR para o banco fazer
+        # um range seek no índice; só com o OR o SQLite varre e ordena tudo
+        queryset = queryset.filter(
+            Q(**{f'{field}__{op}e': value}) & (
+                Q(**{f'{field}__{op}': value}) |
+                Q(**{field: value, f'id__{op}': pk})
+            )
+        )
+    return queryset
+
+
+def paginate(queryset, field, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """
+    Paginação por cursor (keyset) sobre (field, id).
+
+    Em vez de OFFSET, filtra a partir da posição do último item da página
+    anterior, então o custo de cada página independe da profundidade.
+    Retorna (itens, próximo_cursor).
+    """
+    queryset = page_queryset(queryset, field, cursor, descending)
+    return _split_page(list(queryset[:limit + 1]), field, limit)
+
+
+async def apaginate(queryset, field, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """
+    Versão assíncrona de paginate, para views async (ORM assíncrono)
+    """
+    queryset = page_queryset(queryset, field, cursor, descending)
+    return _split_page([item async for item in queryset[:limit + 1]], field, limit)
+
+
+def _split_page(items, field, limit):
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return items, next_cursor
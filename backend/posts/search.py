@@ -0,0 +1,233 @@
+"""
+Busca textual nos posts: título, conteúdo e autor do post e o texto dos
+seus comentários. Os resultados vêm ordenados por relevância e paginados
+por cursor sobre (rank, id).
+
+Cada banco usa o próprio índice (migrações 0013_post_search e
+0015_post_search_unaccent), com o mesmo resultado: post e comentários são um
+documento só (todos os termos precisam aparecer nele) e acentos são ignorados.
+- Postgres: expressões tsvector (sem acentos, via posts_unaccent) com
+  índices GIN em posts_post e posts_comment, mantidos pelo próprio banco;
+- SQLite: tabela virtual FTS5 posts_search, uma linha por post (rowid = id
+  do post), mantida pelos signals de Post e Comment: comentários novos são
+  acrescentados à linha, edições e remoções reindexam o post. Escritas que
+  não passam pelos signals (bulk_create, update(), SQL direto) precisam de
+  `python manage.py rebuild_search_index`.
+"""
+import base64
+import binascii
+import math
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .models import Comment, Post
+from .pagination import DEFAULT_PAGE_SIZE, is_valid_id
+
+TERM_PATTERN = re.compile(r'\w+')
+MAX_TERMS = 10
+
+# Sem stemming nem stopwords (o conteúdo mistura idiomas); acentos removidos
+# por posts_unaccent (unaccent IMMUTABLE), como o remove_diacritics do FTS5.
+# As expressões precisam ser idênticas às dos índices da migração
+# 0015_post_search_unaccent para o Postgres usá-los
+POSTGRES_POST_VECTOR = (
+    "setweight(to_tsvector('simple', posts_unaccent(title)), 'A') || "
+    "setweight(to_tsvector('simple', posts_unaccent(content)), 'B') || "
+    "setweight(to_tsvector('simple', posts_unaccent(username)), 'C')"
+)
+POSTGRES_COMMENT_VECTOR = "to_tsvector('simple', posts_unaccent(content))"
+POSTGRES_TERM_QUERY = "plainto_tsquery('simple', posts_unaccent(%s))"
+
+SQLITE_TABLE = 'posts_search'
+# Pesos do bm25 por coluna do FTS5: title, content, username, comments
+SQLITE_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+
+class SearchNotSupported(Exception):
+    """
+    O banco configurado não tem índice de busca (só Postgres e SQLite têm)
+    """
+
+
+def parse_terms(query):
+    """
+    Extrai os termos de busca de ?q=. Todos precisam aparecer no resultado.
+    Levanta ValueError se não houver nenhum
+    """
+    terms = TERM_PATTERN.findall(query or '')[:MAX_TERMS]
+    if not terms:
+        raise ValueError('Informe o termo de busca (q)')
+    return terms
+
+
+def encode_cursor(rank, pk):
+    """
+    Codifica a posição (rank, id) do último resultado da página
+    """
+    raw = f'{rank!r}|{pk}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por encode_cursor. Levanta ValueError se for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        rank, pk = raw.rsplit('|', 1)
+        rank, pk = float(rank), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Cursor inválido')
+
+    # nan/inf quebrariam a ordenação; ids fora da faixa estourariam no banco
+    if not math.isfinite(rank) or not is_valid_id(pk):
+        raise ValueError('Cursor inválido')
+    return rank, pk
+
+
+def search(terms, cursor=None, limit=DEFAULT_PAGE_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Retorna ([(post_id, rank), ...], próximo_cursor), do mais relevante para
+    o menos relevante. Levanta SearchNotSupported fora do Postgres e do SQLite
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        sql, params = _postgres_sql(connection, terms)
+    elif connection.vendor == 'sqlite':
+        sql, params = _sqlite_sql(terms)
+    else:
+        raise SearchNotSupported(f'Busca textual não suportada em {connection.vendor}')
+
+    if cursor:
+        rank, pk = decode_cursor(cursor)
+        sql += ' WHERE rank < %s OR (rank = %s AND id < %s)'
+        params += [rank, rank, pk]
+    sql += ' ORDER BY rank DESC, id DESC LIMIT %s'
+    params.append(limit + 1)
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(sql, params)
+        results = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor(results[-1][1], results[-1][0])
+    return results, next_cursor
+
+
+def _postgres_sql(connection, terms):
+    qn = connection.ops.quote_name
+    posts_table = qn(Post._meta.db_table)
+    comments_table = qn(Comment._meta.db_table)
+    # Como no FTS5, o post e seus comentários formam um documento só: cada
+    # termo precisa aparecer no post ou em algum comentário, não todos no
+    # mesmo. Cada termo filtra pelas expressões indexadas (GIN) e os posts
+    # que têm todos os termos saem da interseção
+    matches = ' INTERSECT '.join(
+        f'(SELECT id FROM {posts_table} WHERE {POSTGRES_POST_VECTOR} @@ {POSTGRES_TERM_QUERY} '
+        f'UNION SELECT post_id FROM {comments_table} WHERE {POSTGRES_COMMENT_VECTOR} @@ {POSTGRES_TERM_QUERY})'
+        for _ in terms
+    )
+    # Qualquer termo (||: OR entre tsqueries), para somar o rank do post e o
+    # dos comentários que casaram
+    any_term = ' || '.join([POSTGRES_TERM_QUERY] * len(terms))
+    sql = (
+        f'WITH matched AS ({matches}) '
+        f'SELECT id, rank FROM ('
+        f'SELECT m.id, ('
+        f'COALESCE((SELECT ts_rank({POSTGRES_POST_VECTOR}, {any_term}) '
+        f'FROM {posts_table} WHERE id = m.id), 0) + '
+        f"COALESCE((SELECT SUM(ts_rank(setweight({POSTGRES_COMMENT_VECTOR}, 'D'), {any_term})) "
+        f'FROM {comments_table} WHERE post_id = m.id AND {POSTGRES_COMMENT_VECTOR} @@ ({any_term})), 0)'
+        f')::float8 AS rank FROM matched m'
+        f') AS ranked'
+    )
+    params = [term for term in terms for _ in range(2)] + list(terms) * 3
+    return sql, params
+
+
+def _sqlite_sql(terms):
+    # Cada termo entre aspas: o texto do usuário nunca vira sintaxe do FTS5
+    match = ' '.join(f'"{term}"' for term in terms)
+    weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+    # bm25 é menor quanto mais relevante: negado, para ordenar como no Postgres
+    sql = (
+        f'SELECT id, rank FROM ('
+        f'SELECT rowid AS id, -bm25({SQLITE_TABLE}, {weights}) AS rank '
+        f'FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s'
+        f') AS ranked'
+    )
+    return sql, [match]
+
+
+def _sqlite_index_sql(where=''):
+    return (
+        f'INSERT INTO {SQLITE_TABLE} (rowid, title, content, username, comments) '
+        f'SELECT p.id, p.title, p.content, p.username, '
+        f"(SELECT group_concat(c.content, ' ') FROM {Comment._meta.db_table} c "
+        f'WHERE c.post_id = p.id) '
+        f'FROM {Post._meta.db_table} p{where}'
+    )
+
+
+def index_post(post_id, using=DEFAULT_DB_ALIAS):
+    """
+    (Re)indexa um post e seus comentários no FTS5. No Postgres não faz nada
+    """
+    index_posts([post_id], using)
+
+
+def index_posts(post_ids, using=DEFAULT_DB_ALIAS):
+    """
+    index_post para vários posts, com as mesmas duas queries
+    """
+    connection = connections[using]
+    post_ids = list(post_ids)
+    if connection.vendor != 'sqlite' or not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid IN ({placeholders})', post_ids)
+        cursor.execute(_sqlite_index_sql(f' WHERE p.id IN ({placeholders})'), post_ids)
+
+
+def append_comment(post_id, content, using=DEFAULT_DB_ALIAS):
+    """
+    Acrescenta o texto de um comentário novo à linha do post no FTS5, sem
+    refazer o group_concat de todos os comentários. No Postgres não faz nada
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SQLITE_TABLE} SET comments = coalesce(comments || ' ', '') || %s "
+            f'WHERE rowid = %s',
+            [content, post_id],
+        )
+
+
+def remove_post(post_id, using=DEFAULT_DB_ALIAS):
+    """
+    Remove um post do FTS5. No Postgres não faz nada
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """
+    Reconstrói o FTS5 a partir das tabelas. Retorna quantos posts foram indexados
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return 0
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+        cursor.execute(_sqlite_index_sql())
+        return cursor.rowcount
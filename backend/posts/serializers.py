@@ -36,7 +36,8 @@ class MentionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'mentioned_username', 'created_at']
 
 class PostSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(source='user.username', read_only=True)
+    # Campo desnormalizado (Post.save mantém igual a user.username), evita um join por post
+    username = serializers.CharField(read_only=True)
     likes_count = serializers.IntegerField(read_only=True)
     comments_count = serializers.IntegerField(read_only=True)
     user_liked = serializers.SerializerMethodField()
@@ -47,6 +48,9 @@ class PostSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username', 'created_datetime', 'likes_count', 'comments_count', 'user_liked']
     
     def get_user_liked(self, obj):
+        # Querysets de Post.objects.with_user_liked() já trazem user_liked anotado
+        if hasattr(obj, 'user_liked'):
+            return obj.user_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
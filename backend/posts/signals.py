@@ -0,0 +1,98 @@
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as feed_cache
+from . import search
+from . import uploads
+from .models import Comment, Like, Post
+
+
+def adjust_counter(post_id, field, delta):
+    """
+    Atualiza um contador desnormalizado do Post com F(), sem ler o valor atual.
+    Deve rodar na mesma transação do insert/delete que originou a mudança.
+    """
+    queryset = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        # Nunca deixar o contador negativo (reconcile_counters corrige divergências)
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    return queryset.update(**{field: F(field) + delta})
+
+
+def cascades_from_post(origin):
+    """
+    O delete começou em um Post (ou QuerySet de posts): likes e comentários
+    saem junto com o post, então não há contador nem cache a atualizar
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, Post)
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(instance.post_id, 'likes_count', 1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, origin=None, **kwargs):
+    if cascades_from_post(origin):
+        return
+    adjust_counter(instance.post_id, 'likes_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(instance.post_id, 'comments_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if cascades_from_post(origin):
+        return
+    adjust_counter(instance.post_id, 'comments_count', -1)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, using, **kwargs):
+    feed_cache.invalidate_post(instance.pk)
+    search.index_post(instance.pk, using)
+    if created:
+        feed_cache.invalidate_head()
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, using, **kwargs):
+    feed_cache.invalidate_post(instance.pk)
+    search.remove_post(instance.pk, using)
+    feed_cache.invalidate_all()
+    if instance.stored_image_id:
+        uploads.release_image(instance.stored_image_id)
+
+
+@receiver([post_save, post_delete], sender=Like)
+@receiver([post_save, post_delete], sender=Comment)
+def interaction_changed(sender, instance, origin=None, **kwargs):
+    # Likes/comentários mudam apenas os contadores do post no cache do feed
+    # (no delete em cascata do post, post_deleted já invalida)
+    if cascades_from_post(origin):
+        return
+    feed_cache.invalidate_post(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, using, **kwargs):
+    # O texto dos comentários faz parte da linha do post no índice de busca
+    if created:
+        search.append_comment(instance.post_id, instance.content, using)
+    else:
+        search.index_post(instance.post_id, using)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted_from_index(sender, instance, using, origin=None, **kwargs):
+    # No delete em cascata do post, post_deleted já remove a linha do índice
+    if not cascades_from_post(origin):
+        search.index_post(instance.post_id, using)
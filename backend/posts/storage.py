@@ -0,0 +1,191 @@
+"""
+Backends de armazenamento das imagens dos posts.
+
+O backend é escolhido em settings.IMAGE_STORAGE_BACKEND (None quando não há
+nenhum configurado) e recebe settings.IMAGE_STORAGE_OPTIONS. save_image/delete_image são os valores
+padrão de IMAGE_UPLOADER/IMAGE_DELETER usados por posts.uploads.
+
+- CloudinaryImageStorage: envia ao Cloudinary (upload em partes acima de chunk_size);
+- FileSystemImageStorage: grava em um diretório local, com chaves no formato
+  de object store (posts/ab/abcdef.jpg). Serve tanto para MEDIA_ROOT quanto
+  para um bucket montado no sistema de arquivos, e permite testes de carga
+  sem rede.
+
+Com base_url (IMAGE_CDN_URL), as URLs retornadas são montadas como
+{base_url}/{chave}, para servir as imagens por uma CDN.
+"""
+import abc
+import functools
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudinary.uploader
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .utils import delete_cloudinary_image_by_url, delete_image_from_cloudinary
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ImageStorage(abc.ABC):
+    """
+    Interface dos backends: save(caminho) -> URL e delete(URL)
+    """
+
+    def __init__(self, base_url=None, folder='posts', chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.folder = folder
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def new_key(self, path):
+        """
+        Chave única para o arquivo, particionada pelo prefixo como em object stores
+        """
+        name = uuid.uuid4().hex
+        extension = os.path.splitext(str(path))[1].lower()
+        return f'{self.folder}/{name[:2]}/{name}{extension}'
+
+    def url(self, key):
+        return f'{self.base_url}/{key}'
+
+    def key_from_url(self, url):
+        """
+        Chave de uma URL gerada por este backend, ou None se a URL não for dele
+        """
+        if self.base_url and url and url.startswith(f'{self.base_url}/'):
+            return url[len(self.base_url) + 1:]
+        return None
+
+    @abc.abstractmethod
+    def save(self, path):
+        """
+        Envia o arquivo e retorna a URL pública
+        """
+
+    @abc.abstractmethod
+    def delete(self, url):
+        """
+        Remove a imagem de uma URL retornada por save
+        """
+
+
+class CloudinaryImageStorage(ImageStorage):
+    def save(self, path):
+        key = self.new_key(path)
+        public_id = os.path.splitext(key)[0]
+        # upload_large envia em partes de chunk_size (arquivos menores vão de uma vez)
+        result = cloudinary.uploader.upload_large(
+            str(path),
+            public_id=public_id,
+            resource_type='image',
+            chunk_size=self.chunk_size,
+        )
+        if self.base_url:
+            return self.url(f"{result['public_id']}.{result['format']}")
+        return result['secure_url']
+
+    def delete(self, url):
+        key = self.key_from_url(url)
+        if key is None:
+            delete_cloudinary_image_by_url(url)
+        else:
+            delete_image_from_cloudinary(os.path.splitext(key)[0])
+
+
+class FileSystemImageStorage(ImageStorage):
+    def __init__(self, location=None, base_url=None, **options):
+        super().__init__(base_url=base_url or settings.MEDIA_URL, **options)
+        self.location = str(location or settings.MEDIA_ROOT)
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='image-storage'
+            )
+        return self._executor
+
+    def path(self, key):
+        return os.path.join(self.location, *key.split('/'))
+
+    def _write_chunk(self, source, fd, offset):
+        with open(source, 'rb') as f:
+            f.seek(offset)
+            data = f.read(self.chunk_size)
+        os.pwrite(fd, data, offset)
+
+    def _write(self, source, destination):
+        """
+        Copia em partes de chunk_size escritas em paralelo (os.pwrite em offsets
+        distintos), para um arquivo .part renomeado só no fim: leitores nunca
+        veem a imagem pela metade
+        """
+        size = os.path.getsize(source)
+        partial = f'{destination}.part'
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            offsets = range(0, size, self.chunk_size)
+            if self.workers > 1 and len(offsets) > 1:
+                for future in [self.executor.submit(self._write_chunk, source, fd, o) for o in offsets]:
+                    future.result()
+            else:
+                for offset in offsets:
+                    self._write_chunk(source, fd, offset)
+        except BaseException:
+            os.close(fd)
+            os.unlink(partial)
+            raise
+        os.close(fd)
+        os.replace(partial, destination)
+
+    def save(self, path):
+        key = self.new_key(path)
+        destination = self.path(key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        self._write(path, destination)
+        return self.url(key)
+
+    def delete(self, url):
+        key = self.key_from_url(url)
+        if key is not None:
+            try:
+                os.unlink(self.path(key))
+            except FileNotFoundError:
+                pass
+
+
+def is_configured():
+    """
+    Há um backend configurado (sem Cloudinary, FileSystem só em DEBUG ou explícito)
+    """
+    return bool(settings.IMAGE_STORAGE_BACKEND)
+
+
+@functools.lru_cache(maxsize=None)
+def get_storage():
+    if not is_configured():
+        raise ImproperlyConfigured('Nenhum backend de imagens configurado (IMAGE_STORAGE_BACKEND)')
+    backend = import_string(settings.IMAGE_STORAGE_BACKEND)
+    return backend(**settings.IMAGE_STORAGE_OPTIONS)
+
+
+@receiver(setting_changed)
+def reset_storage(setting, **kwargs):
+    if setting in ('IMAGE_STORAGE_BACKEND', 'IMAGE_STORAGE_OPTIONS', 'MEDIA_ROOT', 'MEDIA_URL'):
+        get_storage.cache_clear()
+
+
+def save_image(path):
+    return get_storage().save(path)
+
+
+def delete_image(url):
+    get_storage().delete(url)
@@ -1,3 +1,1465 @@
-from django.test import TestCase
+import base64
+import hashlib
+import importlib
+import io
+import json
+import os
+import logging
+import shutil
+import threading
+import time
+import tempfile
+import tracemalloc
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from codeleap_backend import responses
+from codeleap_backend.request_logging import SamplingFilter, TruncateFilter, summarize_request
+from codeleap_backend.responses import iter_json_array, iter_ndjson, json_response
+
+from .models import Comment, Like, Mention, Post, StoredImage
+from .serializers import PostSerializer
+from . import auth, feed, search, storage, uploads
+from .auth import get_user_from_token
+from .image_processing import process_image
+from .upload_handlers import BoundedImageUploadHandler
+from .mentions import create_mentions, extract_mentions
+from .pagination import encode_cursor, page_queryset, paginate
+
+User = get_user_model()
+
+
+def auth_header(user):
+    """
+    Retorna o header Authorization com um access token válido para o usuário
+    """
+    token = RefreshToken.for_user(user).access_token
+    return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+
+class PostListPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice')
+        self.posts = [
+            Post.objects.create(user=self.user, title=f'Post {i}', content='...')
+            for i in range(5)
+        ]
+
+    def fetch(self, **params):
+        response = self.client.get('/careers/', params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_walks_feed_with_cursor(self):
+        seen = []
+        body = self.fetch(limit=2)
+        while True:
+            seen.extend(post['id'] for post in body['data'])
+            if not body['next']:
+                break
+            body = self.fetch(limit=2, cursor=body['next'])
+
+        expected = [post.id for post in reversed(self.posts)]
+        self.assertEqual(seen, expected)
+
+    def test_ties_on_created_datetime_are_broken_by_id(self):
+        Post.objects.update(created_datetime=timezone.now())
+
+        first = self.fetch(limit=3)
+        second = self.fetch(limit=3, cursor=first['next'])
+
+        ids = [p['id'] for p in first['data']] + [p['id'] for p in second['data']]
+        self.assertEqual(ids, sorted((p.id for p in self.posts), reverse=True))
+        self.assertIsNone(second['next'])
+
+    def test_invalid_params_return_400(self):
+        self.assertEqual(self.client.get('/careers/', {'cursor': 'lixo'}).status_code, 400)
+        overflow = base64.urlsafe_b64encode(f'{timezone.now().isoformat()}|{2 ** 64}'.encode()).decode()
+        self.assertEqual(self.client.get('/careers/', {'cursor': overflow}).status_code, 400)
+        self.assertEqual(self.client.get('/careers/', {'limit': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get('/careers/', {'limit': '0'}).status_code, 400)
+
+
+class PostListQueryCountTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+
+    def create_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(user=self.alice, title=f'Post {i}', content='...')
+            Like.objects.create(post=post, user=self.bob)
+            Comment.objects.create(post=post, user=self.bob, content='oi')
+
+    def count_feed_queries(self, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/careers/', {'limit': 100}, **headers)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), json.loads(response.content)
+
+    def test_feed_query_count_is_constant(self):
+        self.create_posts(2)
+        few, _ = self.count_feed_queries(**auth_header(self.bob))
+        self.create_posts(20)
+        many, body = self.count_feed_queries(**auth_header(self.bob))
+
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 3)  # usuário do token + ETag + feed
+        post = body['data'][0]
+        self.assertEqual(post['likes_count'], 1)
+        self.assertEqual(post['comments_count'], 1)
+        self.assertTrue(post['user_liked'])
+
+    def test_anonymous_feed_is_a_single_query(self):
+        self.create_posts(10)
+        queries, body = self.count_feed_queries()
+
+        self.assertEqual(queries, 1)
+        self.assertFalse(any(post['user_liked'] for post in body['data']))
+
+    def test_serializer_uses_annotations(self):
+        self.create_posts(3)
+        posts = list(Post.objects.with_user_liked(self.alice))
+
+        with self.assertNumQueries(0):
+            data = PostSerializer(posts, many=True).data
+
+        self.assertEqual([item['likes_count'] for item in data], [1, 1, 1])
+        self.assertFalse(any(item['user_liked'] for item in data))
+
+
+class GetUserFromTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice')
+
+    def test_token_is_validated_once_per_request(self):
+        request = RequestFactory().get('/careers/', **auth_header(self.user))
+
+        with mock.patch.object(
+            auth.jwt_auth, 'get_validated_token', wraps=auth.jwt_auth.get_validated_token
+        ) as validate, self.assertNumQueries(1):
+            for _ in range(5):
+                self.assertEqual(get_user_from_token(request), self.user)
+
+        self.assertEqual(validate.call_count, 1)
+
+    def test_missing_token_is_memoized_as_none(self):
+        request = RequestFactory().get('/careers/')
+
+        self.assertIsNone(get_user_from_token(request))
+        self.assertIsNone(request.jwt_user)
+
+
+class PostCountersTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.post = Post.objects.create(user=self.alice, title='Post', content='...')
+
+    def test_counters_follow_likes_and_comments(self):
+        like = Like.objects.create(post=self.post, user=self.bob)
+        Like.objects.create(post=self.post, user=self.alice)
+        comment = Comment.objects.create(post=self.post, user=self.bob, content='oi')
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (2, 1))
+
+        like.delete()
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 0))
+
+    def test_deleting_a_user_decrements_counters(self):
+        Like.objects.create(post=self.post, user=self.bob)
+        Comment.objects.create(post=self.post, user=self.bob, content='oi')
+
+        self.bob.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (0, 0))
+
+    def test_deleting_a_post_skips_counter_updates(self):
+        users = [User.objects.create_user(username=f'user{i}') for i in range(10)]
+        for user in users:
+            Like.objects.create(post=self.post, user=user)
+            Comment.objects.create(post=self.post, user=user, content='oi')
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.post.delete()
+
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "posts_post"')]
+        self.assertEqual(updates, [])
+        self.assertFalse(Like.objects.exists() or Comment.objects.exists())
+
+    def test_toggle_like_returns_counter(self):
+        url = f'/careers/{self.post.id}/like/'
+        body = json.loads(self.client.post(url, **auth_header(self.bob)).content)
+        self.assertEqual(body['data']['likes_count'], 1)
+
+        body = json.loads(self.client.post(url, **auth_header(self.bob)).content)
+        self.assertEqual(body['data']['likes_count'], 0)
+
+    def test_reconcile_counters_fixes_drift(self):
+        Like.objects.create(post=self.post, user=self.bob)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=3)
+
+        call_command('reconcile_counters', stdout=io.StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 0))
+
+
+class ToggleLikeConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+    TOGGLES_PER_THREAD = 10
+
+    def setUp(self):
+        self.post = Post.objects.create(title='Post', content='...')
+        self.users = [User.objects.create_user(username=f'user{i}') for i in range(self.THREADS)]
+
+    def run_in_threads(self, target, args_list):
+        errors = []
+        barrier = threading.Barrier(len(args_list))
+
+        def worker(*args):
+            try:
+                barrier.wait()
+                target(*args)
+            except Exception as e:  # pragma: no cover - falha reportada abaixo
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=args) for args in args_list]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def toggle_repeatedly(self, user_id):
+        for _ in range(self.TOGGLES_PER_THREAD):
+            Like.objects.toggle(self.post.pk, user_id)
+
+    def test_parallel_toggles_keep_counter_consistent(self):
+        self.run_in_threads(self.toggle_repeatedly, [(user.pk,) for user in self.users])
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, Like.objects.filter(post=self.post).count())
+
+    def test_double_tap_from_same_user_never_duplicates(self):
+        user = self.users[0]
+        self.run_in_threads(self.toggle_repeatedly, [(user.pk,)] * self.THREADS)
+
+        self.post.refresh_from_db()
+        likes = Like.objects.filter(post=self.post, user=user).count()
+        self.assertIn(likes, (0, 1))
+        self.assertEqual(self.post.likes_count, likes)
+
+    def test_toggle_view_returns_new_state(self):
+        url = f'/careers/{self.post.id}/like/'
+        headers = auth_header(self.users[0])
+
+        first = json.loads(self.client.post(url, **headers).content)['data']
+        second = json.loads(self.client.post(url, **headers).content)['data']
+
+        self.assertEqual(first, {'action': 'added', 'likes_count': 1, 'user_liked': True})
+        self.assertEqual(second, {'action': 'removed', 'likes_count': 0, 'user_liked': False})
+
+
+class CreateMentionsTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(user=self.author, title='Post', content='...')
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(30)])
+
+    def test_extract_mentions_removes_duplicates(self):
+        self.assertEqual(extract_mentions('@ana oi @bia @ana @ana'), ['ana', 'bia'])
+
+    def test_query_count_does_not_grow_with_mentions(self):
+        content = ' '.join(f'@user{i} @user{i}' for i in range(30)) + ' @author @ghost'
+
+        with self.assertNumQueries(2):
+            create_mentions(self.post, content, self.author)
+
+        mentioned = set(self.post.mentions.values_list('mentioned_user__username', flat=True))
+        self.assertEqual(mentioned, {f'user{i}' for i in range(30)})
+
+    def test_existing_mentions_are_ignored(self):
+        create_mentions(self.post, '@user1', self.author)
+        create_mentions(self.post, '@user1 @user2', self.author)
+
+        self.assertEqual(Mention.objects.filter(post=self.post).count(), 2)
+
+
+class CommentAndMentionListTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(user=self.author, title='Post', content='...')
+        self.users = [User.objects.create_user(username=f'user{i}') for i in range(6)]
+        for user in self.users:
+            Comment.objects.create(post=self.post, user=user, content=f'oi @{user.username}')
+            Mention.objects.create(post=self.post, mentioned_user=user)
+
+    def walk(self, url, limit):
+        items, cursor = [], None
+        while True:
+            params = {'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            with self.assertNumQueries(3):  # ETag + post + página
+                body = json.loads(self.client.get(url, params).content)
+            items.extend(body['data'])
+            cursor = body['next']
+            if not cursor:
+                return items
+
+    def test_comments_are_paginated_oldest_first(self):
+        comments = self.walk(f'/careers/{self.post.id}/comments/', limit=4)
+
+        self.assertEqual([c['username'] for c in comments], [u.username for u in self.users])
+
+    def test_mentions_are_paginated(self):
+        mentions = self.walk(f'/careers/{self.post.id}/mentions/', limit=4)
+
+        self.assertEqual(
+            [m['mentioned_username'] for m in mentions],
+            [u.username for u in self.users]
+        )
+
+
+class FeedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.post = Post.objects.create(user=self.alice, title='Post', content='...')
+
+    def feed(self, **headers):
+        return json.loads(self.client.get('/careers/', **headers).content)['data']
+
+    def test_anonymous_hit_does_not_touch_the_database(self):
+        self.feed()
+        with self.assertNumQueries(0):
+            self.feed()
+
+    def test_user_liked_is_overlaid_per_viewer(self):
+        Like.objects.create(post=self.post, user=self.bob)
+        self.feed()  # popula o cache
+
+        self.assertTrue(self.feed(**auth_header(self.bob))[0]['user_liked'])
+        self.assertFalse(self.feed(**auth_header(self.alice))[0]['user_liked'])
+        self.assertFalse(self.feed()[0]['user_liked'])
+
+    def test_likes_and_comments_invalidate_the_post(self):
+        self.feed()
+        self.client.post(f'/careers/{self.post.id}/like/', **auth_header(self.bob))
+        Comment.objects.create(post=self.post, user=self.bob, content='oi')
+
+        post = self.feed()[0]
+        self.assertEqual((post['likes_count'], post['comments_count']), (1, 1))
+
+    def test_new_and_deleted_posts_invalidate_pages(self):
+        self.feed()
+        newer = Post.objects.create(user=self.bob, title='Novo', content='...')
+        self.assertEqual([p['id'] for p in self.feed()], [newer.id, self.post.id])
+
+        newer.delete()
+        self.assertEqual([p['id'] for p in self.feed()], [self.post.id])
+
+    def test_page_computed_before_an_invalidation_is_not_served(self):
+        created = []
+
+        def paginate_then_create(*args, **kwargs):
+            # Um post novo entra (e invalida o head) enquanto a página é calculada
+            page = paginate(*args, **kwargs)
+            created.append(Post.objects.create(user=self.bob, title='Durante', content='...'))
+            return page
+
+        with mock.patch.object(feed, 'paginate', side_effect=paginate_then_create):
+            self.assertEqual([p['id'] for p in self.feed()], [self.post.id])
+
+        self.assertEqual([p['id'] for p in self.feed()], [created[0].id, self.post.id])
+
+    def test_reconcile_counters_invalidates_the_feed(self):
+        Like.objects.create(post=self.post, user=self.bob)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7)
+        self.assertEqual(self.feed()[0]['likes_count'], 7)
+
+        call_command('reconcile_counters', stdout=io.StringIO())
+
+        self.assertEqual(self.feed()[0]['likes_count'], 1)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.post = Post.objects.create(user=self.alice, title='Post', content='...')
+        Comment.objects.create(post=self.post, user=self.bob, content='oi @bob')
+        Mention.objects.create(post=self.post, mentioned_user=self.bob)
+
+    def assert_revalidates(self, url, **headers):
+        first = self.client.get(url, **headers)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        return etag
+
+    def test_read_endpoints_return_304_when_unchanged(self):
+        self.assert_revalidates('/careers/')
+        self.assert_revalidates(f'/careers/{self.post.id}/comments/')
+        self.assert_revalidates(f'/careers/{self.post.id}/mentions/')
+
+    def test_etag_changes_with_edits_likes_and_viewer(self):
+        etag = self.assert_revalidates('/careers/')
+
+        self.client.patch(
+            f'/careers/{self.post.id}/', json.dumps({'title': 'Editado'}),
+            content_type='application/json', **auth_header(self.alice)
+        )
+        edited = self.assert_revalidates('/careers/')
+        self.assertNotEqual(etag, edited)
+
+        Like.objects.create(post=self.post, user=self.bob)
+        liked = self.assert_revalidates('/careers/')
+        self.assertNotEqual(edited, liked)
+
+        as_bob = self.assert_revalidates('/careers/', **auth_header(self.bob))
+        self.assertNotEqual(liked, as_bob)
+
+    def test_polling_saves_bytes(self):
+        for i in range(20):
+            latest = Post.objects.create(user=self.alice, title=f'Post {i}', content='x' * 500)
+
+        polls = 50
+        full = self.client.get('/careers/')
+        etag = full['ETag']
+        naive_bytes = len(full.content) * polls
+
+        conditional_bytes = len(full.content)
+        statuses = []
+        for i in range(polls - 1):
+            if i == 25:
+                # Uma mudança no meio do polling força um novo 200
+                Like.objects.create(post=latest, user=self.bob)
+            response = self.client.get('/careers/', HTTP_IF_NONE_MATCH=etag)
+            if response.status_code == 200:
+                etag = response['ETag']
+            statuses.append(response.status_code)
+            conditional_bytes += len(response.content)
+
+        self.assertEqual(statuses.count(200), 1)
+        saved = 1 - conditional_bytes / naive_bytes
+        self.assertGreater(saved, 0.9)
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice')
+        self.post = Post.objects.create(user=self.alice, title='Post', content='...')
+        self.client = AsyncClient()
+
+    async def test_views_run_on_the_event_loop(self):
+        feed = await self.client.get('/careers/')
+        self.assertEqual(feed.status_code, 200)
+        self.assertEqual(json.loads(feed.content)['data'][0]['id'], self.post.id)
+
+        revalidated = await self.client.get('/careers/', headers={'If-None-Match': feed['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.alice).access_token))()
+        headers = {'Authorization': f'Bearer {token}'}
+
+        like = await self.client.post(f'/careers/{self.post.id}/like/', headers=headers)
+        self.assertEqual(json.loads(like.content)['data']['likes_count'], 1)
+
+        comment = await self.client.post(
+            f'/careers/{self.post.id}/comments/', json.dumps({'content': 'oi'}),
+            content_type='application/json', headers=headers
+        )
+        self.assertEqual(comment.status_code, 201)
+
+        comments = await self.client.get(f'/careers/{self.post.id}/comments/')
+        self.assertEqual(len(json.loads(comments.content)['data']), 1)
+
+        mentions = await self.client.get(f'/careers/{self.post.id}/mentions/')
+        self.assertEqual(mentions.status_code, 200)
+
+        missing = await self.client.get('/careers/999/comments/')
+        self.assertEqual(missing.status_code, 404)
+
+
+class JSONResponseTests(TestCase):
+    def setUp(self):
+        self.created = timezone.now()
+        self.data = {'data': [{'id': 1, 'title': 'Olá', 'created_datetime': self.created}], 'next': None}
+
+    def test_datetimes_are_serialized_like_isoformat(self):
+        response = json_response(self.data, status=201)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = json.loads(response.content)
+        self.assertEqual(body['data'][0]['created_datetime'], self.created.isoformat())
+        self.assertEqual(body['data'][0]['title'], 'Olá')
+
+    def test_stdlib_fallback_matches_orjson(self):
+        expected = responses.dumps(self.data)
+        # Recarregar com o orjson de volta ao final (as views usam o mesmo módulo)
+        self.addCleanup(importlib.reload, responses)
+        with mock.patch.dict('sys.modules', {'orjson': None}):
+            fallback = importlib.reload(responses)
+        self.assertIsNone(fallback.orjson)
+        self.assertEqual(fallback.dumps(self.data), expected)
+
+    def test_streaming_array_and_ndjson(self):
+        items = [{'id': i, 'created_at': self.created} for i in range(7)]
+
+        array = b''.join(iter_json_array(iter(items), batch_size=3))
+        self.assertEqual([item['id'] for item in json.loads(array)], list(range(7)))
+        self.assertEqual(b''.join(iter_json_array([])), b'[]')
+
+        lines = b''.join(iter_ndjson(items, batch_size=3)).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], list(range(7)))
+
+
+def current_rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class PostExportTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', is_staff=True)
+        self.alice = User.objects.create_user(username='alice')
+
+    def create_posts(self, total, batch_size=10000):
+        for start in range(0, total, batch_size):
+            Post.objects.bulk_create(
+                Post(user=self.alice, username='alice', title=f'Post {i}', content='conteúdo ' * 20)
+                for i in range(start, min(total, start + batch_size))
+            )
+
+    def export(self, export_format='json'):
+        return self.client.get(f'/careers/export/?format={export_format}', **auth_header(self.staff))
+
+    def test_export_is_restricted_to_staff(self):
+        self.assertEqual(self.client.get('/careers/export/').status_code, 401)
+        self.assertEqual(
+            self.client.get('/careers/export/', **auth_header(self.alice)).status_code, 403
+        )
+        self.assertEqual(self.export('xml').status_code, 400)
+
+    def test_json_array_and_ndjson(self):
+        self.create_posts(5)
+
+        response = self.export()
+        self.assertTrue(response.streaming)
+        posts = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(posts), 5)
+        self.assertEqual(posts[0]['title'], 'Post 4')
+
+        response = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [post['id'] for post in posts])
+
+    async def test_asgi_export_uses_an_async_iterator(self):
+        await Post.objects.acreate(user=self.alice, username='alice', title='T', content='C')
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.staff).access_token))()
+
+        response = await AsyncClient().get('/careers/export/', headers={'Authorization': f'Bearer {token}'})
+
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([post['title'] for post in json.loads(body)], ['T'])
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'RSS lido de /proc')
+    def test_peak_rss_is_flat_at_100k_posts(self):
+        def peak_growth():
+            before = peak = current_rss()
+            response = self.export('ndjson')
+            rows = 0
+            for chunk in response.streaming_content:
+                rows += chunk.count(b'\n')
+                peak = max(peak, current_rss())
+            return peak - before, rows
+
+        self.create_posts(10000)
+        small_growth, small_rows = peak_growth()
+        self.create_posts(90000)
+        large_growth, large_rows = peak_growth()
+
+        self.assertEqual((small_rows, large_rows), (10000, 100000))
+        # O export de 100k posts tem ~30 MB; carregado de uma vez, o RSS cresceria mais que isso
+        self.assertLess(large_growth, small_growth + 10 * 1024 * 1024)
+
+
+class UserTimelineTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.alice_posts = [
+            Post.objects.create(user=self.alice, title=f'Alice {i}', content='...') for i in range(5)
+        ]
+        Post.objects.create(user=self.bob, title='Bob', content='...')
+
+    def test_feed_filtered_by_user_with_cursor(self):
+        seen = []
+        url = '/careers/?user=alice&limit=2'
+        while url:
+            body = self.client.get(url).json()
+            seen += [post['id'] for post in body['data']]
+            url = body['next'] and f"/careers/?user=alice&limit=2&cursor={body['next']}"
+
+        self.assertEqual(seen, [post.id for post in reversed(self.alice_posts)])
+        self.assertEqual(self.client.get('/careers/?user=ninguem').json()['data'], [])
+
+    def test_etag_depends_on_user_filter(self):
+        etag = self.client.get('/careers/')['ETag']
+
+        response = self.client.get('/careers/?user=alice', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'plano de execução do SQLite')
+    def test_timeline_is_an_index_range_scan(self):
+        plan = Post.objects.by_author('alice').order_by('-created_datetime', '-id')[:20].explain()
+
+        self.assertIn('post_user_timeline_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'plano de execução do SQLite')
+    def test_cursor_pages_seek_the_index(self):
+        cursor = encode_cursor(timezone.now(), self.alice_posts[2].id)
+
+        feed_plan = page_queryset(Post.objects.all(), 'created_datetime', cursor)[:20].explain()
+        timeline_plan = page_queryset(Post.objects.by_author('alice'), 'created_datetime', cursor)[:20].explain()
+
+        # Range seek a partir do cursor, sem MULTI-INDEX OR nem ordenar a tabela inteira
+        self.assertIn('(created_datetime<?)', feed_plan)
+        self.assertNotIn('MULTI-INDEX OR', feed_plan)
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', feed_plan)
+        self.assertIn('post_user_timeline_idx (user_id=? AND created_datetime<?)', timeline_plan)
+        self.assertNotIn('TEMP B-TREE', timeline_plan)
+
+    def test_profile_posts(self):
+        self.assertEqual(self.client.get('/auth/profile/posts/').status_code, 401)
+
+        Like.objects.create(post=self.alice_posts[-1], user=self.alice)
+        response = self.client.get('/auth/profile/posts/?limit=3', **auth_header(self.alice))
+
+        body = response.json()
+        self.assertEqual([post['title'] for post in body['data']], ['Alice 4', 'Alice 3', 'Alice 2'])
+        self.assertTrue(body['data'][0]['user_liked'])
+        self.assertIsNotNone(body['next'])
+
+
+class MentionsInboxTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.posts = []
+        for i in range(4):
+            post = Post.objects.create(user=self.bob, title=f'Post {i}', content='@alice')
+            Mention.objects.create(post=post, mentioned_user=self.alice)
+            self.posts.append(post)
+        other = Post.objects.create(user=self.alice, title='Outro', content='@bob')
+        Mention.objects.create(post=other, mentioned_user=self.bob)
+
+    def inbox(self, **params):
+        return self.client.get('/auth/profile/mentions/', params, **auth_header(self.alice))
+
+    def test_newest_first_with_post_titles_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            body = self.inbox().json()
+
+        self.assertEqual([item['post_title'] for item in body['data']], ['Post 3', 'Post 2', 'Post 1', 'Post 0'])
+        self.assertEqual(body['data'][0]['post_username'], 'bob')
+        mention_queries = [q for q in ctx.captured_queries if 'posts_mention' in q['sql']]
+        self.assertEqual(len(mention_queries), 1)
+        self.assertIn('posts_post', mention_queries[0]['sql'])
+
+    def test_since_returns_only_new_mentions(self):
+        latest = self.inbox().json()['data'][0]['created_at']
+        self.assertEqual(self.inbox(since=latest).json()['data'], [])
+
+        post = Post.objects.create(user=self.bob, title='Novo', content='@alice')
+        Mention.objects.create(post=post, mentioned_user=self.alice)
+
+        self.assertEqual([item['post_title'] for item in self.inbox(since=latest).json()['data']], ['Novo'])
+
+    def test_cursor_pagination_and_errors(self):
+        first = self.inbox(limit=3).json()
+        second = self.inbox(limit=3, cursor=first['next']).json()
+
+        self.assertEqual(len(first['data']) + len(second['data']), 4)
+        self.assertIsNone(second['next'])
+        self.assertEqual(self.inbox(since='ontem').status_code, 400)
+        self.assertEqual(self.client.get('/auth/profile/mentions/').status_code, 401)
+
+
+class BatchWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.posts = [
+            Post.objects.create(user=self.bob, title=f'Post {i}', content='...') for i in range(3)
+        ]
+
+    def batch(self, operations, user=None):
+        return self.client.post(
+            '/careers/batch/', {'operations': operations},
+            content_type='application/json', **auth_header(user or self.alice),
+        )
+
+    def test_mixed_operations_return_one_result_each(self):
+        first, second, third = self.posts
+        Like.objects.create(post=third, user=self.alice)
+        self.client.get('/careers/')  # popula o cache do feed
+
+        response = self.batch([
+            {'op': 'like', 'post_id': first.id},
+            {'op': 'comment', 'post_id': second.id, 'content': 'Offline @bob'},
+            {'op': 'unlike', 'post_id': third.id},
+            {'op': 'share', 'post_id': first.id},
+            {'op': 'like', 'post_id': 999999},
+            {'op': 'like', 'post_id': 2 ** 64},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['data']
+        self.assertEqual([result['status'] for result in results], [200, 201, 200, 400, 404, 404])
+        self.assertEqual(results[0]['likes_count'], 1)
+        self.assertEqual(results[1]['data']['id'], Comment.objects.get().id)
+        self.assertEqual(results[2]['likes_count'], 0)
+
+        self.assertTrue(Mention.objects.filter(post=second, mentioned_user=self.bob).exists())
+        counts = {post['id']: post for post in self.client.get('/careers/').json()['data']}
+        self.assertEqual(counts[first.id]['likes_count'], 1)
+        self.assertEqual(counts[second.id]['comments_count'], 1)
+        self.assertEqual(counts[third.id]['likes_count'], 0)
+        self.assertEqual(
+            [post['id'] for post in self.client.get('/careers/search/?q=offline').json()['data']],
+            [second.id],
+        )
+
+    def test_replays_are_idempotent_and_last_like_wins(self):
+        post = self.posts[0]
+        Like.objects.create(post=post, user=self.bob)
+
+        self.batch([{'op': 'like', 'post_id': post.id}])
+        results = self.batch([
+            {'op': 'like', 'post_id': post.id},
+            {'op': 'unlike', 'post_id': post.id},
+            {'op': 'like', 'post_id': post.id},
+        ]).json()['data']
+
+        self.assertEqual(results[-1]['likes_count'], 2)
+        post.refresh_from_db()
+        self.assertEqual(post.likes_count, 2)
+        self.assertEqual(Like.objects.filter(post=post).count(), 2)
+
+    def test_query_count_does_not_grow_with_operations(self):
+        posts = Post.objects.bulk_create(
+            [Post(user=self.bob, username='bob', title=f'Extra {i}', content='...') for i in range(40)]
+        )
+
+        def queries(count):
+            operations = [
+                {'op': 'like', 'post_id': post.id} if i % 2 else
+                {'op': 'comment', 'post_id': post.id, 'content': f'@bob {i}'}
+                for i, post in enumerate(posts[:count])
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                self.batch(operations)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries(5), queries(40))
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.post('/careers/batch/', {}, content_type='application/json').status_code, 401)
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch([{'op': 'like', 'post_id': 1}] * 101).status_code, 400)
+        response = self.client.post(
+            '/careers/batch/', 'nao e json', content_type='application/json', **auth_header(self.alice)
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchReadTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.posts = Post.objects.bulk_create(
+            [Post(user=self.alice, username='alice', title=f'Post {i}', content='...') for i in range(30)]
+        )
+
+    def test_returns_posts_in_requested_order(self):
+        first, second, third = self.posts[:3]
+        Like.objects.create(post=second, user=self.alice)
+        Comment.objects.create(post=second, user=self.alice, content='Oi')
+
+        response = self.client.get(
+            f'/careers/batch/?ids={third.id},{first.id},999999,{second.id},{first.id}',
+            **auth_header(self.alice),
+        )
+
+        body = response.json()
+        self.assertEqual([post['id'] for post in body['data']], [third.id, first.id, second.id])
+        self.assertEqual(body['missing'], [999999])
+        self.assertEqual(
+            [(post['likes_count'], post['comments_count'], post['user_liked']) for post in body['data']],
+            [(0, 0, False), (0, 0, False), (1, 1, True)],
+        )
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_query_count_is_fixed(self):
+        def queries(count):
+            ids = ','.join(str(post.id) for post in self.posts[:count])
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f'/careers/batch/?ids={ids}', **auth_header(self.alice))
+            self.assertEqual(len(response.json()['data']), count)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries(3), queries(30))
+
+    def test_invalid_ids(self):
+        invalid = (
+            '', '?ids=', '?ids=1,a', '?ids=' + ','.join(str(i) for i in range(1, 102)),
+            '?ids=0', '?ids=-1', f'?ids=1,{2 ** 63}', '?ids=' + '9' * 30,
+        )
+        for query in invalid:
+            self.assertEqual(self.client.get(f'/careers/batch/{query}').status_code, 400)
+
+    def test_out_of_range_post_id_in_the_path_is_404(self):
+        for pk in (2 ** 63, 2 ** 70):
+            for path in ('comments', 'mentions'):
+                self.assertEqual(self.client.get(f'/careers/{pk}/{path}/').status_code, 404)
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+
+    def search(self, query, **params):
+        return self.client.get('/careers/search/', {'q': query, **params}, **auth_header(self.bob))
+
+    def test_ranks_title_matches_first_and_includes_comments(self):
+        in_content = Post.objects.create(user=self.alice, title='Outro', content='Deploy no Railway')
+        in_title = Post.objects.create(user=self.alice, title='Railway', content='Passo a passo')
+        in_comment = Post.objects.create(user=self.alice, title='Dúvida', content='Onde hospedar?')
+        Comment.objects.create(post=in_comment, user=self.bob, content='Tente o railway')
+        Post.objects.create(user=self.alice, title='Nada', content='Sem relação')
+        Like.objects.create(post=in_title, user=self.bob)
+
+        response = self.search('RAILWAY')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual([post['id'] for post in data], [in_title.id, in_content.id, in_comment.id])
+        self.assertTrue(data[0]['user_liked'])
+        self.assertGreater(data[0]['rank'], data[1]['rank'])
+
+    def test_all_terms_must_match_and_accents_are_ignored(self):
+        post = Post.objects.create(user=self.alice, title='Configuração', content='do servidor')
+        Post.objects.create(user=self.alice, title='Configuracao', content='do banco')
+
+        data = self.search('configuracao servidor').json()['data']
+
+        self.assertEqual([item['id'] for item in data], [post.id])
+
+    def test_terms_can_match_the_post_and_its_comments(self):
+        post = Post.objects.create(user=self.alice, title='Deploy', content='texto')
+        Comment.objects.create(post=post, user=self.bob, content='use o railway')
+        Post.objects.create(user=self.alice, title='Deploy', content='sem comentários')
+
+        data = self.search('deploy railway').json()['data']
+
+        self.assertEqual([item['id'] for item in data], [post.id])
+
+    def test_postgres_query_binds_every_placeholder(self):
+        for terms in (['deploy'], ['deploy', 'railway', 'cache']):
+            sql, params = search._postgres_sql(connection, terms)
+            self.assertEqual(sql.count('%s'), len(params))
+            self.assertEqual(sql.count('INTERSECT'), len(terms) - 1)
+
+    def test_index_follows_updates_and_deletes(self):
+        post = Post.objects.create(user=self.alice, title='Antigo', content='texto')
+        comment = Comment.objects.create(post=post, user=self.bob, content='comentário único')
+
+        post.title = 'Novo'
+        post.save()
+        self.assertEqual(self.search('antigo').json()['data'], [])
+        self.assertEqual(len(self.search('novo').json()['data']), 1)
+
+        comment.delete()
+        self.assertEqual(self.search('único').json()['data'], [])
+
+        post.delete()
+        self.assertEqual(self.search('novo').json()['data'], [])
+
+    def test_new_comments_are_indexed_incrementally(self):
+        post = Post.objects.create(user=self.alice, title='Post', content='texto')
+        for i in range(5):
+            Comment.objects.create(post=post, user=self.bob, content=f'comentário {i}')
+
+        with CaptureQueriesContext(connection) as ctx:
+            Comment.objects.create(post=post, user=self.bob, content='incremental')
+
+        self.assertFalse(any('group_concat' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual([item['id'] for item in self.search('incremental').json()['data']], [post.id])
+        self.assertEqual(len(self.search('comentário 3').json()['data']), 1)
+
+    def test_post_delete_does_not_reindex_each_comment(self):
+        post = Post.objects.create(user=self.alice, title='Post', content='texto')
+        for i in range(10):
+            Comment.objects.create(post=post, user=self.bob, content=f'comentário {i}')
+
+        with CaptureQueriesContext(connection) as ctx:
+            post.delete()
+
+        self.assertFalse(any('group_concat' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(self.search('comentário').json()['data'], [])
+
+    def test_cursor_pagination(self):
+        for i in range(5):
+            Post.objects.create(user=self.alice, title=f'Python {i}', content='texto')
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            body = self.search('python', **params).json()
+            seen += [post['id'] for post in body['data']]
+            cursor = body['next']
+            if not cursor:
+                break
+
+        self.assertEqual(sorted(seen), sorted(Post.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), 5)
+
+    def test_invalid_query_and_cursor(self):
+        self.assertEqual(self.search('  !!  ').status_code, 400)
+        self.assertEqual(self.search('python', cursor='invalido').status_code, 400)
+        for raw in ('nan|1', 'inf|1', f'1.5|{2 ** 70}', '1.5|0'):
+            cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+            self.assertEqual(self.search('python', cursor=cursor).status_code, 400)
+        self.assertEqual(self.client.post('/careers/search/').status_code, 405)
+
+    def test_unsupported_database_is_a_clear_error(self):
+        Post.objects.create(user=self.alice, title='Python', content='texto')
+
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            response = self.search('python')
+
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('indisponível', response.json()['error'])
+
+    def test_rebuild_picks_up_bulk_created_posts(self):
+        Post.objects.bulk_create([Post(user=self.alice, username='alice', title='Em massa', content='x')])
+        self.assertEqual(self.search('massa').json()['data'], [])
+
+        call_command('rebuild_search_index', stdout=io.StringIO())
+
+        self.assertEqual(len(self.search('massa').json()['data']), 1)
+
+
+class RequestLoggingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice')
+
+    def test_summary_redacts_credentials(self):
+        request = RequestFactory().post(
+            '/auth/refresh/', json.dumps({'refresh': 'segredo', 'username': 'alice'}),
+            content_type='application/json', HTTP_AUTHORIZATION='Bearer segredo'
+        )
+        summary = summarize_request(request)
+
+        self.assertEqual(summary['headers']['Authorization'], '***')
+        self.assertEqual(summary['body'], {'refresh': '***', 'username': 'alice'})
+
+    def test_multipart_post_never_logs_the_body(self):
+        image = SimpleUploadedFile('foto.png', b'\x89PNG' + b'0' * 50000, content_type='image/png')
+
+        with mock.patch('codeleap_backend.request_logging.random.random', return_value=0), \
+                self.assertLogs('codeleap.requests', level='INFO') as logs:
+            self.client.post('/careers/', {'title': 'T', 'content': 'C', 'image': image})
+
+        output = '\n'.join(logs.output)
+        self.assertIn('bytes omitidos', output)
+        self.assertNotIn('0000000000', output)
+
+    def test_sampling_and_truncation_filters(self):
+        def record(level, message):
+            return logging.LogRecord('codeleap.requests', level, __file__, 1, message, None, None)
+
+        self.assertFalse(SamplingFilter(rate=0).filter(record(logging.INFO, 'x')))
+        self.assertTrue(SamplingFilter(rate=0).filter(record(logging.WARNING, 'x')))
+
+        long_record = record(logging.INFO, 'x' * 5000)
+        TruncateFilter(max_length=100).filter(long_record)
+        self.assertLess(len(long_record.getMessage()), 200)
+
+
+UPLOAD_DELAY = 0.5
+uploaded_paths = []
+
+
+def slow_fake_uploader(path):
+    """
+    Uploader falso injetado via settings.IMAGE_UPLOADER: simula um host lento
+    """
+    uploaded_paths.append(path)
+    time.sleep(UPLOAD_DELAY)
+    return f'https://imagens.test/{os.path.basename(path)}'
+
+
+def failing_fake_uploader(path):
+    raise RuntimeError('host fora do ar')
+
+
+# Os bytes falsos destes testes não são imagens decodificáveis pelo Pillow
+@override_settings(IMAGE_PROCESSING_ENABLED=False)
+class BackgroundImageUploadTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        uploaded_paths.clear()
+        self.user = User.objects.create_user(username='alice')
+
+    def create_post_with_image(self):
+        image = SimpleUploadedFile('foto.png', b'\x89PNG\r\n\x1a\n' + b'0' * 1024, content_type='image/png')
+        start = time.perf_counter()
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+        elapsed = time.perf_counter() - start
+        self.assertEqual(response.status_code, 201)
+        return json.loads(response.content)['data'], elapsed
+
+    @override_settings(IMAGE_UPLOADER='posts.tests.slow_fake_uploader')
+    def test_post_is_created_before_the_upload_finishes(self):
+        data, elapsed = self.create_post_with_image()
+
+        self.assertLess(elapsed, UPLOAD_DELAY)
+        self.assertEqual(data['image_status'], 'pending')
+        self.assertIsNone(data['image'])
+
+        uploads.wait_for_uploads(timeout=5)
+        post = Post.objects.get(pk=data['id'])
+        self.assertEqual(post.image_status, Post.IMAGE_READY)
+        self.assertTrue(post.image.startswith('https://imagens.test/'))
+        self.assertFalse(os.path.exists(uploaded_paths[0]))
+
+        feed_post = json.loads(self.client.get('/careers/').content)['data'][0]
+        self.assertEqual(feed_post['image'], post.image)
+
+    @override_settings(IMAGE_UPLOADER='posts.tests.failing_fake_uploader')
+    def test_failed_upload_is_recorded(self):
+        data, _ = self.create_post_with_image()
+
+        uploads.wait_for_uploads(timeout=5)
+        post = Post.objects.get(pk=data['id'])
+        self.assertEqual(post.image_status, Post.IMAGE_FAILED)
+        self.assertIsNone(post.image)
+
+    # Produção sem Cloudinary: nenhum backend, e o /media não seria servido
+    @override_settings(IMAGE_STORAGE_BACKEND=None)
+    def test_upload_is_unavailable_without_a_storage_backend(self):
+        image = SimpleUploadedFile('foto.png', b'\x89PNG\r\n\x1a\n' + b'0' * 1024, content_type='image/png')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+        post = Post.objects.create(user=self.user, username='alice', title='T', content='C')
+        image.seek(0)
+        response = self.client.patch(
+            f'/careers/{post.pk}/', encode_multipart(BOUNDARY, {'image': image}),
+            content_type=MULTIPART_CONTENT, **auth_header(self.user)
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Post.objects.get(pk=post.pk).image_status, Post.IMAGE_NONE)
+
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR'
+
+
+@override_settings(MAX_IMAGE_UPLOAD_SIZE=64 * 1024 * 1024, IMAGE_UPLOAD_SPOOL_THRESHOLD=256 * 1024)
+class BoundedImageUploadHandlerTests(TestCase):
+    CHUNK = 64 * 1024
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice')
+
+    def stream(self, total_size, header=PNG_HEADER):
+        handler = BoundedImageUploadHandler(RequestFactory().post('/careers/'))
+        handler.new_file('image', 'foto.png', 'image/png', total_size)
+        filler = b'0' * self.CHUNK
+        sent = 0
+        first = header + filler[len(header):]
+        while sent < total_size:
+            chunk = first if sent == 0 else filler
+            chunk = chunk[:total_size - sent]
+            handler.receive_data_chunk(chunk, sent)
+            sent += len(chunk)
+        return handler, handler.file_complete(sent)
+
+    def peak_memory(self, total_size):
+        tracemalloc.start()
+        try:
+            _, uploaded = self.stream(total_size)
+            return tracemalloc.get_traced_memory()[1], uploaded
+        finally:
+            tracemalloc.stop()
+
+    def test_peak_memory_is_flat_regardless_of_size(self):
+        small_peak, small = self.peak_memory(2 * 1024 * 1024)
+        large_peak, large = self.peak_memory(32 * 1024 * 1024)
+
+        self.assertTrue(hasattr(large, 'temporary_file_path'))
+        self.assertLess(large_peak, 2 * small_peak)
+        self.assertLess(large_peak, 4 * 1024 * 1024)
+        small.close()
+        large.close()
+
+    def test_small_uploads_stay_in_memory_and_are_hashed(self):
+        _, uploaded = self.stream(10 * 1024)
+
+        self.assertFalse(hasattr(uploaded, 'temporary_file_path'))
+        self.assertEqual(uploaded.image_format, 'png')
+        uploaded.seek(0)
+        self.assertEqual(uploaded.content_hash, hashlib.sha256(uploaded.read()).hexdigest())
+
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=100 * 1024)
+    def test_oversized_upload_is_rejected_with_413(self):
+        image = SimpleUploadedFile('foto.png', PNG_HEADER + b'0' * 200 * 1024, content_type='image/png')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=100 * 1024, DATA_UPLOAD_MAX_MEMORY_SIZE=10 * 1024)
+    def test_oversized_content_length_is_rejected_before_parsing(self):
+        image = SimpleUploadedFile('foto.png', PNG_HEADER + b'0' * 200 * 1024, content_type='image/png')
+        with mock.patch('posts.views.parse_multipart') as parse:
+            response = self.client.post(
+                '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+            )
+
+        self.assertEqual(response.status_code, 413)
+        parse.assert_not_called()
+
+    def test_non_image_is_rejected_by_magic_bytes(self):
+        fake = SimpleUploadedFile('foto.png', b'<html>nao sou png</html>', content_type='image/png')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': fake}, **auth_header(self.user)
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+
+deleted_urls = []
+
+
+def recording_uploader(path):
+    uploaded_paths.append(path)
+    return f'https://imagens.test/{len(uploaded_paths)}.png'
+
+
+def recording_deleter(url):
+    deleted_urls.append(url)
+
+
+@override_settings(
+    IMAGE_UPLOADER='posts.tests.recording_uploader',
+    IMAGE_DELETER='posts.tests.recording_deleter',
+    IMAGE_PROCESSING_ENABLED=False,
+)
+class ImageDeduplicationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        uploaded_paths.clear()
+        deleted_urls.clear()
+        self.user = User.objects.create_user(username='alice')
+
+    def post_image(self, payload):
+        image = SimpleUploadedFile('foto.png', PNG_HEADER + payload, content_type='image/png')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+        uploads.wait_for_uploads(timeout=5)
+        return Post.objects.get(pk=json.loads(response.content)['data']['id'])
+
+    def test_same_image_is_uploaded_once(self):
+        first = self.post_image(b'mesma imagem')
+        second = self.post_image(b'mesma imagem')
+        other = self.post_image(b'outra imagem')
+
+        self.assertEqual(len(uploaded_paths), 2)
+        self.assertEqual(first.image, second.image)
+        self.assertNotEqual(first.image, other.image)
+        self.assertEqual(second.image_status, Post.IMAGE_READY)
+        self.assertEqual(StoredImage.objects.get(url=first.image).ref_count, 2)
+
+    def test_image_is_deleted_with_its_last_post(self):
+        first = self.post_image(b'mesma imagem')
+        second = self.post_image(b'mesma imagem')
+
+        first.delete()
+        self.assertEqual(deleted_urls, [])
+
+        second.delete()
+        self.assertEqual(deleted_urls, [second.image])
+        self.assertFalse(StoredImage.objects.exists())
+
+    def test_replacing_an_image_releases_the_old_one(self):
+        post = self.post_image(b'antiga')
+        old_url = post.image
+
+        image = SimpleUploadedFile('nova.png', PNG_HEADER + b'nova', content_type='image/png')
+        self.client.patch(
+            f'/careers/{post.id}/',
+            encode_multipart(BOUNDARY, {'image': image}),
+            content_type=MULTIPART_CONTENT,
+            **auth_header(self.user)
+        )
+        uploads.wait_for_uploads(timeout=5)
+
+        post.refresh_from_db()
+        self.assertNotEqual(post.image, old_url)
+        self.assertEqual(deleted_urls, [old_url])
+
+
+@override_settings(
+    IMAGE_UPLOADER='posts.tests.recording_uploader',
+    IMAGE_DELETER='posts.tests.recording_deleter',
+    IMAGE_PROCESSING_ENABLED=False,
+)
+class StaleUploadTests(TransactionTestCase):
+    """
+    Upload que nunca terminou: o post e o temporário existem, mas o worker
+    morreu antes do _submit
+    """
+
+    def setUp(self):
+        cache.clear()
+        uploaded_paths.clear()
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+        settings_override = override_settings(IMAGE_UPLOAD_SPOOL_DIR=self.spool_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='alice')
+
+    def stuck_post(self, minutes_ago=60):
+        post = Post.objects.create(
+            user=self.user, username='alice', title='T', content='C', image_status=Post.IMAGE_PENDING
+        )
+        uploads._spool(post.pk, SimpleUploadedFile('foto.png', PNG_HEADER + b'perdida'))
+        Post.objects.filter(pk=post.pk).update(updated_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return post
+
+    def reap(self, *args):
+        call_command('reap_stale_uploads', *args, stdout=io.StringIO())
+
+    def test_stale_upload_is_failed_and_its_temp_file_removed(self):
+        stale = self.stuck_post()
+        recent = self.stuck_post(minutes_ago=1)
+
+        self.reap()
+
+        self.assertEqual(Post.objects.get(pk=stale.pk).image_status, Post.IMAGE_FAILED)
+        self.assertEqual(Post.objects.get(pk=recent.pk).image_status, Post.IMAGE_PENDING)
+        self.assertEqual([name.split('-')[0] for name in os.listdir(self.spool_dir)], [str(recent.pk)])
+
+    def test_retry_uploads_from_the_temp_file(self):
+        post = self.stuck_post()
+
+        self.reap('--retry')
+
+        post.refresh_from_db()
+        self.assertEqual(post.image_status, Post.IMAGE_READY)
+        self.assertEqual(post.image, 'https://imagens.test/1.png')
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_old_orphan_files_are_removed(self):
+        post = Post.objects.create(user=self.user, username='alice', title='T', content='C')
+        orphan = os.path.join(self.spool_dir, f'{post.pk}-abc.png')
+        open(orphan, 'wb').close()
+        old = time.time() - 3600
+        os.utime(orphan, (old, old))
+
+        self.reap()
+
+        self.assertFalse(os.path.exists(orphan))
+
+
+def jpeg_with_exif(size=(1600, 1000), orientation=6):
+    """
+    JPEG com EXIF de orientação (6 = girar 90°) e um campo de metadado qualquer
+    """
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = 'Camera de teste'
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+class ImageProcessingTests(TestCase):
+    def process(self, data, suffix='.jpg'):
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(data)
+        self.addCleanup(os.unlink, tmp.name)
+        variants = process_image(tmp.name)
+        for path in variants.values():
+            self.addCleanup(os.unlink, path)
+        return variants
+
+    def test_resize_respects_exif_orientation_and_strips_metadata(self):
+        variants = self.process(jpeg_with_exif())
+
+        with Image.open(variants['image']) as image:
+            # 1600x1000 girada vira 1000x1600, reduzida para caber em 800x600
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (375, 600))
+            self.assertEqual(len(image.getexif()), 0)
+
+        with Image.open(variants['webp']) as webp:
+            self.assertEqual(webp.format, 'WEBP')
+            self.assertEqual(webp.size, (375, 600))
+
+        with Image.open(variants['thumbnail']) as thumbnail:
+            self.assertEqual(thumbnail.format, 'WEBP')
+            self.assertLessEqual(max(thumbnail.size), 200)
+        self.assertLess(os.path.getsize(variants['thumbnail']), os.path.getsize(variants['image']))
+
+    def test_invalid_image_leaves_no_files_behind(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'foto.png')
+            with open(path, 'wb') as f:
+                f.write(PNG_HEADER + b'corrompido')
+
+            with self.assertRaises(Exception):
+                process_image(path)
+            self.assertEqual(os.listdir(directory), ['foto.png'])
+
+
+@override_settings(
+    IMAGE_UPLOADER='posts.tests.recording_uploader',
+    IMAGE_DELETER='posts.tests.recording_deleter',
+    IMAGE_PROCESSING_ENABLED=True,
+)
+class ProcessedImageUploadTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        uploaded_paths.clear()
+        deleted_urls.clear()
+        self.user = User.objects.create_user(username='alice')
+
+    def test_variants_are_uploaded_and_referenced_by_the_feed(self):
+        image = SimpleUploadedFile('foto.jpg', jpeg_with_exif(), content_type='image/jpeg')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+        uploads.wait_for_uploads(timeout=30)
+
+        post = Post.objects.get(pk=json.loads(response.content)['data']['id'])
+        self.assertEqual(post.image_status, Post.IMAGE_READY)
+        self.assertEqual(len(uploaded_paths), 3)
+        self.assertFalse(any(os.path.exists(path) for path in uploaded_paths))
+
+        feed_post = json.loads(self.client.get('/careers/').content)['data'][0]
+        self.assertEqual(feed_post['image'], post.image)
+        self.assertEqual(feed_post['image_thumbnail'], post.image_thumbnail)
+        self.assertEqual(feed_post['image_webp'], post.image_webp)
+
+        post.delete()
+        self.assertCountEqual(deleted_urls, [post.image, post.image_thumbnail, post.image_webp])
+
+    def test_undecodable_image_fails_the_upload(self):
+        image = SimpleUploadedFile('foto.png', PNG_HEADER + b'corrompido', content_type='image/png')
+        response = self.client.post(
+            '/careers/', {'title': 'T', 'content': 'C', 'image': image}, **auth_header(self.user)
+        )
+        uploads.wait_for_uploads(timeout=30)
+
+        post = Post.objects.get(pk=json.loads(response.content)['data']['id'])
+        self.assertEqual(post.image_status, Post.IMAGE_FAILED)
+        self.assertEqual(uploaded_paths, [])
+
+
+class FileSystemImageStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+
+    def source_file(self, data):
+        with tempfile.NamedTemporaryFile(suffix='.JPG', delete=False) as tmp:
+            tmp.write(data)
+        self.addCleanup(os.unlink, tmp.name)
+        return tmp.name
+
+    def test_parallel_chunked_write_round_trip(self):
+        data = os.urandom(1024 * 1024 + 123)
+        backend = storage.FileSystemImageStorage(
+            location=self.location, base_url='https://cdn.test/', chunk_size=64 * 1024, workers=4
+        )
+
+        url = backend.save(self.source_file(data))
+
+        self.assertRegex(url, r'^https://cdn\.test/posts/([0-9a-f]{2})/\1[0-9a-f]{30}\.jpg$')
+        with open(backend.path(backend.key_from_url(url)), 'rb') as f:
+            self.assertEqual(f.read(), data)
+        self.assertFalse(any(name.endswith('.part') for _, _, files in os.walk(self.location) for name in files))
+
+        backend.delete(url)
+        self.assertFalse(os.path.exists(backend.path(backend.key_from_url(url))))
+        # URLs de outros hosts são ignoradas
+        backend.delete('https://outro-host.test/posts/ab/abc.jpg')
+
+    def test_backend_comes_from_settings(self):
+        options = {'location': self.location, 'base_url': '/imagens/', 'chunk_size': 1024, 'workers': 1}
+        with override_settings(
+            IMAGE_STORAGE_BACKEND='posts.storage.FileSystemImageStorage', IMAGE_STORAGE_OPTIONS=options
+        ):
+            url = storage.save_image(self.source_file(b'imagem'))
+            self.assertTrue(url.startswith('/imagens/posts/'))
+            self.assertEqual(storage.get_storage().location, self.location)
+
+            storage.delete_image(url)
+        self.assertEqual([files for _, _, files in os.walk(self.location) if files], [])
+
+    def test_backends_must_implement_save_and_delete(self):
+        class OnlySave(storage.ImageStorage):
+            def save(self, path):
+                return self.url(path)
+
+        with self.assertRaises(TypeError):
+            OnlySave()
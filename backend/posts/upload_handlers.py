@@ -0,0 +1,147 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+# Assinaturas (magic bytes) dos formatos aceitos
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+MAGIC_BYTES_LENGTH = 12
+
+
+def detect_image_format(header):
+    """
+    Identifica o formato pelos primeiros bytes do arquivo, ou None se não for imagem suportada
+    """
+    for signature, image_format in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def too_large_error():
+    """
+    (mensagem, status HTTP) de uma imagem acima de MAX_IMAGE_UPLOAD_SIZE
+    """
+    return f'Imagem excede o tamanho máximo de {settings.MAX_IMAGE_UPLOAD_SIZE // (1024 * 1024)} MB', 413
+
+
+def exceeds_upload_limit(request):
+    """
+    O Content-Length já passa da imagem máxima mais os campos do formulário
+    (DATA_UPLOAD_MAX_MEMORY_SIZE): dá para recusar sem ler o corpo
+    """
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return False
+    fields = settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0
+    return length > settings.MAX_IMAGE_UPLOAD_SIZE + fields
+
+
+def parse_multipart(request):
+    """
+    Lê o corpo multipart com o BoundedImageUploadHandler e retorna (campos, arquivos).
+    Bloqueia (lê o corpo e pode gravar um temporário): nas views async, rodar
+    via sync_to_async
+    """
+    request.upload_handlers = [BoundedImageUploadHandler(request)]
+    if request.method == 'POST':
+        return request.POST, request.FILES
+    # O Django só popula request.POST/FILES em POST; nos demais métodos o parse é explícito
+    return request.parse_file_upload(request.META, request)
+
+
+class BoundedImageUploadHandler(FileUploadHandler):
+    """
+    Recebe imagens em streaming, sem depender dos handlers padrão do Django:
+
+    - interrompe o upload assim que o tamanho passa de MAX_IMAGE_UPLOAD_SIZE;
+    - valida os magic bytes logo no primeiro chunk;
+    - calcula o sha256 enquanto os chunks chegam (file.content_hash);
+    - mantém o arquivo em memória e só usa arquivo temporário acima de
+      IMAGE_UPLOAD_SPOOL_THRESHOLD, então a memória por upload fica limitada.
+
+    Em caso de erro, o motivo fica em request.upload_error (mensagem, status HTTP).
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = settings.MAX_IMAGE_UPLOAD_SIZE
+        self.spool_threshold = settings.IMAGE_UPLOAD_SPOOL_THRESHOLD
+
+    def _reject(self, message, status):
+        if self.request is not None:
+            self.request.upload_error = (message, status)
+        self.upload_interrupted()
+        raise StopUpload(connection_reset=True)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = BytesIO()
+        self.size = 0
+        self.header = b''
+        self.image_format = None
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self._reject(*too_large_error())
+
+        if self.image_format is None and len(self.header) < MAGIC_BYTES_LENGTH:
+            self.header += raw_data[:MAGIC_BYTES_LENGTH - len(self.header)]
+            if len(self.header) == MAGIC_BYTES_LENGTH:
+                self.image_format = detect_image_format(self.header)
+                if self.image_format is None:
+                    self._reject('Formato de imagem não suportado', 400)
+
+        self.hasher.update(raw_data)
+
+        if isinstance(self.file, BytesIO) and self.size > self.spool_threshold:
+            # Passou do limite em memória: transferir para um arquivo temporário
+            spooled = TemporaryUploadedFile(
+                self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+            )
+            spooled.write(self.file.getvalue())
+            self.file = spooled
+
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.image_format is None:
+            # Arquivo menor que MAGIC_BYTES_LENGTH: validar com o que chegou
+            self.image_format = detect_image_format(self.header)
+            if self.image_format is None:
+                self._reject('Formato de imagem não suportado', 400)
+
+        self.file.seek(0)
+        if isinstance(self.file, BytesIO):
+            uploaded = InMemoryUploadedFile(
+                file=self.file,
+                field_name=self.field_name,
+                name=self.file_name,
+                content_type=self.content_type,
+                size=file_size,
+                charset=self.charset,
+                content_type_extra=self.content_type_extra,
+            )
+        else:
+            uploaded = self.file
+            uploaded.size = file_size
+
+        uploaded.content_hash = self.hasher.hexdigest()
+        uploaded.image_format = self.image_format
+        return uploaded
+
+    def upload_interrupted(self):
+        if isinstance(getattr(self, 'file', None), TemporaryUploadedFile):
+            self.file.close()
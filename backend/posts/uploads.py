@@ -0,0 +1,344 @@
+"""
+Upload de imagens em segundo plano.
+
+O post é criado na hora com image_status='pending'; o arquivo é copiado para
+um temporário e enviado ao host de imagens por um pool de threads, sem
+prender o worker do gunicorn. Ao terminar, a URL é gravada no post.
+
+Imagens são deduplicadas pelo sha256 do conteúdo (StoredImage): uma imagem
+já enviada é reaproveitada sem upload, e só é apagada do host quando o
+último post que a usa deixa de usá-la.
+
+Antes do envio, a imagem é processada localmente com Pillow
+(posts.image_processing) em um pool de processos, para que a decodificação
+não segure o GIL dos workers web: redimensionamento, miniatura, WebP e
+remoção de metadados.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import cache as feed_cache
+from . import image_processing
+from . import storage
+from .models import Post, StoredImage
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_process_pool = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def get_executor():
+    """
+    Pool criado sob demanda, para que cada processo (após o fork do gunicorn) tenha o seu
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_UPLOAD_WORKERS,
+                thread_name_prefix='image-upload',
+            )
+        return _executor
+
+
+def get_process_pool():
+    """
+    Pool de processos do processamento das imagens. Usa 'spawn': os filhos não
+    herdam conexões nem threads do processo web
+    """
+    global _process_pool
+    with _executor_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _process_pool
+
+
+def get_uploader():
+    return import_string(settings.IMAGE_UPLOADER)
+
+
+def get_deleter():
+    return import_string(settings.IMAGE_DELETER)
+
+
+def is_available():
+    """
+    Há para onde enviar as imagens: um IMAGE_UPLOADER próprio ou um backend de
+    storage configurado para o uploader padrão
+    """
+    return get_uploader() is not storage.save_image or storage.is_configured()
+
+
+def _digest(image_file):
+    # BoundedImageUploadHandler já calcula o hash enquanto o upload chega
+    digest = getattr(image_file, 'content_hash', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in image_file.chunks():
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    return digest
+
+
+def get_spool_dir():
+    os.makedirs(settings.IMAGE_UPLOAD_SPOOL_DIR, exist_ok=True)
+    return settings.IMAGE_UPLOAD_SPOOL_DIR
+
+
+def _spool(post_id, image_file):
+    """
+    Copia o upload para um arquivo temporário: os arquivos da requisição são
+    fechados quando a resposta termina, antes do upload acabar. O nome começa
+    com o id do post ({id}-xxxx.png; as variantes do Pillow ficam ao lado),
+    para o reap_stale_uploads achar os arquivos de um upload interrompido
+    """
+    extension = os.path.splitext(image_file.name or '')[1]
+    with tempfile.NamedTemporaryFile(
+        prefix=f'{post_id}-', suffix=extension, dir=get_spool_dir(), delete=False
+    ) as tmp:
+        for chunk in image_file.chunks():
+            tmp.write(chunk)
+    return tmp.name
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _delete_from_host(url):
+    try:
+        get_deleter()(url)
+    except Exception as e:
+        logger.error(f"Error deleting image {url}: {str(e)}")
+
+
+def release_image(stored_image_id):
+    """
+    Libera uma referência; a imagem só sai do host quando ninguém mais a usa
+    """
+    orphan = StoredImage.objects.release(stored_image_id)
+    if orphan is not None:
+        transaction.on_commit(lambda: [_delete_from_host(url) for url in orphan.urls])
+
+
+def link_stored_image(post_id, stored):
+    """
+    Aponta o post para a imagem (cuja referência já foi adquirida) e libera a anterior
+    """
+    with transaction.atomic():
+        previous = list(
+            Post.objects.select_for_update().filter(pk=post_id)
+            .values_list('stored_image_id', flat=True)
+        )
+        if not previous:
+            # Post removido antes de o upload terminar
+            release_image(stored.pk)
+            return False
+
+        Post.objects.filter(pk=post_id).update(
+            image=stored.url,
+            image_thumbnail=stored.thumbnail_url,
+            image_webp=stored.webp_url,
+            stored_image=stored,
+            image_status=Post.IMAGE_READY,
+            updated_at=timezone.now(),
+        )
+        if previous[0] is not None:
+            release_image(previous[0])
+
+    # update() não dispara signals
+    feed_cache.invalidate_post(post_id)
+    return True
+
+
+def _store(digest, urls):
+    try:
+        with transaction.atomic():
+            return StoredImage.objects.create(
+                digest=digest,
+                url=urls['image'],
+                thumbnail_url=urls.get('thumbnail'),
+                webp_url=urls.get('webp'),
+                ref_count=1,
+            )
+    except IntegrityError:
+        # Outro upload da mesma imagem terminou antes: usar o dele e apagar esta cópia
+        stored = StoredImage.objects.acquire(digest)
+        if stored is None:
+            return _store(digest, urls)
+        for url in urls.values():
+            _delete_from_host(url)
+        return stored
+
+
+def _process(path):
+    """
+    Gera as variantes da imagem no pool de processos. Sem Pillow (ou com o
+    processamento desligado), envia apenas o arquivo original
+    """
+    if not (settings.IMAGE_PROCESSING_ENABLED and image_processing.is_available()):
+        return {'image': path}
+    return get_process_pool().submit(image_processing.process_image, path).result()
+
+
+def _upload(post_id, path, digest):
+    variants = {}
+    try:
+        variants = _process(path)
+        uploader = get_uploader()
+        urls = {name: uploader(variant) for name, variant in variants.items()}
+        link_stored_image(post_id, _store(digest, urls))
+        logger.info(f"Image uploaded for post {post_id}: {urls['image']}")
+    except Exception as e:
+        logger.error(f"Error uploading image for post {post_id}: {str(e)}")
+        Post.objects.filter(pk=post_id).update(
+            image_status=Post.IMAGE_FAILED, updated_at=timezone.now()
+        )
+        feed_cache.invalidate_post(post_id)
+    finally:
+        for temp_path in {path, *variants.values()}:
+            # O reap_stale_uploads pode ter removido os arquivos de um upload lento
+            _remove(temp_path)
+        connection.close()
+
+
+def _submit(post_id, path, digest):
+    future = get_executor().submit(_upload, post_id, path, digest)
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+
+
+def attach_image(post, image_file):
+    """
+    Associa a imagem ao post. Se o mesmo conteúdo já foi enviado, reaproveita a
+    URL na hora (sem upload); senão agenda o upload, que só começa após o commit
+    para que a thread de upload enxergue o post
+    """
+    digest = _digest(image_file)
+
+    stored = StoredImage.objects.acquire(digest)
+    if stored is not None:
+        link_stored_image(post.pk, stored)
+        post.image = stored.url
+        post.image_thumbnail = stored.thumbnail_url
+        post.image_webp = stored.webp_url
+        post.stored_image = stored
+        post.image_status = Post.IMAGE_READY
+        return
+
+    path = _spool(post.pk, image_file)
+    transaction.on_commit(lambda: _submit(post.pk, path, digest))
+
+
+def wait_for_uploads(timeout=None):
+    """
+    Aguarda os uploads em andamento (testes e desligamento do processo)
+    """
+    return wait(list(_pending), timeout=timeout)
+
+
+def _spooled(post_id=None):
+    """
+    {caminho: id do post} dos arquivos temporários no diretório de spool
+    (de um post só, se post_id for informado)
+    """
+    spool_dir = get_spool_dir()
+    files = {}
+    for name in os.listdir(spool_dir):
+        owner, _, rest = name.partition('-')
+        if rest and owner.isdigit() and (post_id is None or int(owner) == post_id):
+            files[os.path.join(spool_dir, name)] = int(owner)
+    return files
+
+
+def _original(paths):
+    # O original é {id}-xxxx.ext; as variantes têm sufixos extras (.full.png, .thumb.webp)
+    for path in paths:
+        if '.' not in os.path.splitext(os.path.basename(path))[0]:
+            return path
+    return None
+
+
+def _file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def reap_stale_uploads(older_than, retry=False):
+    """
+    Recupera posts presos em image_status='pending' há mais de older_than
+    (timedelta): o worker que fazia o upload foi reciclado, morto ou estourou
+    o timeout, e o on_commit/_upload nunca terminou.
+
+    Com retry, o upload é refeito aqui mesmo a partir do arquivo temporário,
+    se ele ainda existir; senão (ou sem retry) o post vai para 'failed'. Os
+    arquivos temporários dos posts recuperados e os órfãos mais antigos que
+    older_than são removidos. Retorna (reenviados, falhos, órfãos removidos)
+    """
+    cutoff = timezone.now() - older_than
+    retried = failed = 0
+    stale = list(
+        Post.objects.filter(image_status=Post.IMAGE_PENDING, updated_at__lt=cutoff)
+        .values_list('pk', flat=True)
+    )
+    for post_id in stale:
+        paths = list(_spooled(post_id))
+        original = _original(paths)
+        # O UPDATE condicional reivindica o post: outro reaper (ou o upload
+        # original, se terminar agora) fica com ele se chegar antes
+        claim = Post.objects.filter(pk=post_id, image_status=Post.IMAGE_PENDING, updated_at__lt=cutoff)
+        if retry and original is not None:
+            if not claim.update(updated_at=timezone.now()):
+                continue
+            for path in paths:
+                if path != original:
+                    _remove(path)
+            # _upload remove o temporário e grava 'ready' ou 'failed'
+            _submit(post_id, original, _file_digest(original))
+            retried += 1
+            continue
+
+        if not claim.update(image_status=Post.IMAGE_FAILED, updated_at=timezone.now()):
+            continue
+        feed_cache.invalidate_post(post_id)
+        logger.warning(f"Stale image upload for post {post_id} marked as failed")
+        for path in paths:
+            _remove(path)
+        failed += 1
+
+    wait_for_uploads()
+
+    # Órfãos: arquivos antigos de uploads que não estão mais pendentes
+    pending = set(Post.objects.filter(image_status=Post.IMAGE_PENDING).values_list('pk', flat=True))
+    removed = 0
+    for path, post_id in _spooled().items():
+        try:
+            modified = os.path.getmtime(path)
+        except FileNotFoundError:
+            continue
+        if post_id not in pending and modified < cutoff.timestamp():
+            _remove(path)
+            removed += 1
+    return retried, failed, removed
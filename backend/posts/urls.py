@@ -6,6 +6,15 @@ urlpatterns = [
     # GET e POST para /careers/ (lista e criação)
     path('', views.post_list, name='post_list'),
     
+    # Exportação do feed inteiro em streaming (JSON ou NDJSON)
+    path('export/', views.post_export, name='post_export'),
+    
+    # Posts por ids (GET) e likes/comentários em lote (POST, filas offline dos clientes móveis)
+    path('batch/', views.post_batch, name='post_batch'),
+    
+    # Busca textual nos posts e comentários (?q=), por relevância
+    path('search/', views.post_search, name='post_search'),
+    
     # PATCH e DELETE para /careers/{id}/ (atualização e exclusão)
     path('<int:pk>/', views.post_detail, name='post_detail'),
     
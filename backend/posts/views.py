@@ -9,137 +9,106 @@ from .serializers import (
 )
 import logging
 import json
-from django.http import JsonResponse, HttpResponse
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
-import re
-from .utils import upload_image_to_cloudinary
-import os
+from django.utils.cache import patch_vary_headers
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from asgiref.sync import sync_to_async
+from codeleap_backend.request_logging import log_request, summarize_request
+from codeleap_backend.responses import json_response, streaming_json_response
+from .mentions import create_mentions
+from . import uploads
+from .uploads import attach_image
+from .upload_handlers import exceeds_upload_limit, parse_multipart, too_large_error
+from .pagination import apaginate, parse_ids, parse_limit
+from .auth import aget_optional_user, aget_user_from_token, get_user_from_token
+from . import batch
+from . import cache as feed_cache
+from .feed import get_feed_page, get_timeline_page, post_to_dict
+from . import search
+from .conditional import acondition, comments_etag, feed_etag, mentions_etag
 
 User = get_user_model()
-jwt_auth = JWTAuthentication()
 
 logger = logging.getLogger(__name__)
 
-def get_user_from_token(request):
+def create_post(post_data, image, user):
     """
-    Extrai o usuário do token JWT do header Authorization
+    Cria o post com a imagem (upload em segundo plano) e as menções em uma transação
     """
-    try:
-        # Verificar se há header Authorization
-        auth_header = request.headers.get('Authorization')
-        
-        if not auth_header or not auth_header.startswith('Bearer '):
-            logger.warning("No Authorization header or invalid format")
-            return None
+    with transaction.atomic():
+        post = Post.objects.create(**post_data)
         
-        # Extrair o token
-        token = auth_header.split(' ')[1]
+        if image:
+            attach_image(post, image)
         
-        # Validar o token e obter o usuário
-        try:
-            validated_token = jwt_auth.get_validated_token(token)
-            user = jwt_auth.get_user(validated_token)
-            
-            if user and user.is_active:
-                logger.debug(f"User authenticated: {user.username}")
-                return user
-            else:
-                logger.warning("User inactive or invalid")
-                return None
-                
-        except (InvalidToken, TokenError) as e:
-            logger.warning(f"Invalid token: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Token validation error: {str(e)}")
-            return None
-    except Exception as e:
-        logger.error(f"Unexpected error in get_user_from_token: {str(e)}")
-        return None
-
-def extract_mentions(content):
-    """
-    Extrai menções (@username) do conteúdo
-    """
-    mention_pattern = r'@(\w+)'
-    mentions = re.findall(mention_pattern, content)
-    return mentions
-
-def create_mentions(post, content, user):
-    """
-    Cria menções para usuários mencionados no conteúdo
-    """
-    mentions = extract_mentions(content)
-    for username in mentions:
-        try:
-            mentioned_user = User.objects.get(username=username)
-            if mentioned_user != user:  # Não mencionar a si mesmo
-                Mention.objects.get_or_create(
-                    post=post,
-                    mentioned_user=mentioned_user
-                )
-        except User.DoesNotExist:
-            logger.warning(f"User {username} not found for mention")
+        # Criar menções se houver
+        create_mentions(post, post_data['content'], user)
+    return post
 
 @csrf_exempt
-def post_list(request):
+@acondition(etag_func=feed_etag)
+async def post_list(request):
     """
-    GET: Lista todos os posts (público)
+    GET: Lista os posts paginados por cursor (público); ?user=<username> filtra por autor
     POST: Cria um novo post (requer autenticação)
     """
     if request.method == 'GET':
-        posts = Post.objects.all()
+        # Resolver o usuário uma única vez; user_liked vem anotado na query
+        user = await aget_optional_user(request)
         
-        # Converter para JSON manualmente
-        posts_data = []
-        for post in posts:
-            # Usar o username do campo username do post
-            username = post.username
-            
-            # Verificar se o usuário atual deu like
-            user_liked = False
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                user = get_user_from_token(request)
-                if user:
-                    user_liked = post.likes.filter(user=user).exists()
-            
-            posts_data.append({
-                'id': post.id,
-                'username': username,
-                'created_datetime': post.created_datetime.isoformat(),
-                'title': post.title,
-                'content': post.content,
-                'image': post.image if post.image else None,
-                'likes_count': post.likes_count,
-                'comments_count': post.comments_count,
-                'user_liked': user_liked
-            })
+        # Paginação por cursor (?limit=&cursor=) em vez de serializar a tabela inteira
+        try:
+            limit = parse_limit(request)
+            author = request.GET.get('user')
+            # Cache + ORM: roda fora do event loop
+            if author:
+                # ?user=<username>: range scan no índice (user, -created_datetime, -id)
+                posts_data, next_cursor = await sync_to_async(get_timeline_page)(
+                    Post.objects.by_author(author), request.GET.get('cursor'), limit, user
+                )
+            elif getattr(request, 'feed_page', None) is not None:
+                # Feed anônimo: a página já veio do cache no cálculo do ETag
+                posts_data, next_cursor = request.feed_page
+            else:
+                posts_data, next_cursor = await sync_to_async(get_feed_page)(
+                    request.GET.get('cursor'), limit, user
+                )
+        except ValueError as e:
+            return json_response({'error': str(e)}, status=400)
         
-        response_data = {'data': posts_data}
+        response_data = {'data': posts_data, 'next': next_cursor}
         
-        return HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=200
-        )
+        response = json_response(response_data)
+        # user_liked depende do token: caches HTTP não podem misturar usuários
+        patch_vary_headers(response, ['Authorization'])
+        return response
     
     elif request.method == 'POST':
-        # Debug: log dos dados recebidos
-        logger.info(f"POST request received")
-        logger.info(f"Content-Type: {request.content_type}")
-        logger.info(f"Request body: {request.body}")
-        logger.info(f"Request headers: {dict(request.headers)}")
+        log_request(request, 'POST /careers/')
         
         try:
             # Verificar se é multipart/form-data (upload de arquivo)
             if request.content_type and 'multipart/form-data' in request.content_type:
-                title = request.POST.get('title')
-                content = request.POST.get('content')
-                image = request.FILES.get('image')
+                if exceeds_upload_limit(request):
+                    message, status_code = too_large_error()
+                    return json_response({'error': message}, status=status_code)
+                # Handler próprio: limita o tamanho e valida a imagem enquanto ela chega.
+                # O parse lê o corpo e grava temporários: fora do event loop
+                form_data, files = await sync_to_async(parse_multipart)(request)
+                title = form_data.get('title')
+                content = form_data.get('content')
+                image = files.get('image')
+                
+                upload_error = getattr(request, 'upload_error', None)
+                if upload_error:
+                    message, status_code = upload_error
+                    return json_response({'error': message}, status=status_code)
+                
+                if image and not uploads.is_available():
+                    logger.warning("Image storage not configured - skipping image upload")
+                    return json_response({'error': 'Upload de imagens temporariamente indisponível.'}, status=400)
             else:
                 # Parse JSON manualmente
                 data = json.loads(request.body.decode('utf-8'))
@@ -148,21 +117,13 @@ def post_list(request):
                 image = None
             
             if not title or not content:
-                return HttpResponse(
-                    json.dumps({'error': 'Title e content são obrigatórios'}),
-                    content_type='application/json',
-                    status=400
-                )
+                return json_response({'error': 'Title e content são obrigatórios'}, status=400)
             
             # Autenticar usuário via token JWT
-            user = get_user_from_token(request)
+            user = await aget_user_from_token(request)
             if not user:
                 logger.error("Failed to authenticate user from token")
-                return HttpResponse(
-                    json.dumps({'error': 'Token de autenticação inválido ou ausente'}),
-                    content_type='application/json',
-                    status=401
-                )
+                return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
             
             # Usar o username do token JWT
             username_from_token = user.username
@@ -176,39 +137,11 @@ def post_list(request):
                 'username': username_from_token
             }
             
-            # Processar imagem se fornecida
+            # A imagem é enviada em segundo plano; o post nasce com upload pendente
             if image:
-                try:
-                    # Verificar se o Cloudinary está configurado
-                    from django.conf import settings
-                    cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
-                    api_key = os.getenv('CLOUDINARY_API_KEY')
-                    api_secret = os.getenv('CLOUDINARY_API_SECRET')
-                    
-                    if not all([cloud_name, api_key, api_secret]):
-                        logger.warning("Cloudinary not configured - skipping image upload")
-                        return HttpResponse(
-                            json.dumps({'error': 'Upload de imagens temporariamente indisponível.'}),
-                            content_type='application/json',
-                            status=400
-                        )
-                    
-                    # Upload para Cloudinary
-                    image_url = upload_image_to_cloudinary(image)
-                    post_data['image'] = image_url
-                    logger.info(f"Image uploaded to Cloudinary: {image_url}")
-                except Exception as e:
-                    logger.error(f"Error uploading image: {str(e)}")
-                    return HttpResponse(
-                        json.dumps({'error': f'Erro ao fazer upload da imagem: {str(e)}'}),
-                        content_type='application/json',
-                        status=500
-                    )
-            
-            post = Post.objects.create(**post_data)
+                post_data['image_status'] = Post.IMAGE_PENDING
             
-            # Criar menções se houver
-            create_mentions(post, content, user)
+            post = await sync_to_async(create_post)(post_data, image, user)
             
             logger.info(f"Post created successfully with ID: {post.id}, username: {post.username}")
             
@@ -221,33 +154,97 @@ def post_list(request):
                     'title': post.title,
                     'content': post.content,
                     'image': post.image if post.image else None,
+                    'image_thumbnail': post.image_thumbnail,
+                    'image_webp': post.image_webp,
+                    'image_status': post.image_status,
                     'username': username_from_token,  # Retornar o username usado
-                    'created_datetime': post.created_datetime.isoformat(),
+                    'created_datetime': post.created_datetime,
                     'likes_count': 0,
                     'comments_count': 0,
                     'user_liked': False
                 }
             }
             
-            return HttpResponse(
-                json.dumps(response_data),
-                content_type='application/json',
-                status=201
-            )
+            return json_response(response_data, status=201)
             
         except json.JSONDecodeError:
-            return HttpResponse(
-                json.dumps({'error': 'JSON inválido'}),
-                content_type='application/json',
-                status=400
-            )
+            return json_response({'error': 'JSON inválido'}, status=400)
         except Exception as e:
             logger.error(f"Error in POST: {e}")
-            return HttpResponse(
-                json.dumps({'error': str(e)}),
-                content_type='application/json',
-                status=500
-            )
+            return json_response({'error': str(e)}, status=500)
+
+EXPORT_FIELDS = (
+    'id', 'username', 'created_datetime', 'title', 'content', 'image', 'image_thumbnail',
+    'image_webp', 'image_status', 'likes_count', 'comments_count',
+)
+# Linhas buscadas do banco por vez: a memória fica limitada a um lote, qualquer que seja o total
+EXPORT_CHUNK_SIZE = 2000
+
+def post_export(request):
+    """
+    GET: Exporta o feed inteiro em streaming (?format=json, padrão, ou ndjson). Apenas staff
+    """
+    if request.method != 'GET':
+        return json_response({'error': 'Método não permitido'}, status=405)
+    
+    user = get_user_from_token(request)
+    if not user:
+        return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
+    if not user.is_staff:
+        return json_response({'error': 'Exportação restrita a usuários staff'}, status=403)
+    
+    export_format = request.GET.get('format', 'json')
+    if export_format not in ('json', 'ndjson'):
+        return json_response({'error': 'Format deve ser json ou ndjson'}, status=400)
+    
+    # values(): dicts direto do cursor, sem instanciar models
+    rows = Post.objects.order_by('-created_datetime', '-id').values(*EXPORT_FIELDS)
+    # O servidor ASGI só faz streaming de iteradores assíncronos
+    if isinstance(request, ASGIRequest):
+        rows = rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+    else:
+        rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    response = streaming_json_response(rows, ndjson=export_format == 'ndjson')
+    response['Content-Disposition'] = f'attachment; filename="posts.{export_format}"'
+    return response
+
+def get_search_page(terms, cursor, limit, user=None):
+    """
+    Retorna (posts_data, próximo_cursor) de uma página da busca, na ordem de relevância
+    """
+    results, next_cursor = search.search(terms, cursor=cursor, limit=limit)
+    posts = Post.objects.with_user_liked(user).in_bulk([post_id for post_id, _ in results])
+    posts_data = [
+        dict(post_to_dict(posts[post_id]), user_liked=posts[post_id].user_liked, rank=rank)
+        for post_id, rank in results if post_id in posts
+    ]
+    return posts_data, next_cursor
+
+async def post_search(request):
+    """
+    GET: Busca textual nos posts e comentários (?q=), por relevância e paginada por cursor (público)
+    """
+    if request.method != 'GET':
+        return json_response({'error': 'Método não permitido'}, status=405)
+    
+    user = await aget_optional_user(request)
+    
+    try:
+        terms = search.parse_terms(request.GET.get('q'))
+        limit = parse_limit(request)
+        posts_data, next_cursor = await sync_to_async(get_search_page)(
+            terms, request.GET.get('cursor'), limit, user
+        )
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
+    except search.SearchNotSupported as e:
+        logger.error(f"Search unavailable: {str(e)}")
+        return json_response({'error': 'Busca textual indisponível neste servidor'}, status=501)
+    
+    response = json_response({'data': posts_data, 'next': next_cursor})
+    patch_vary_headers(response, ['Authorization'])
+    return response
 
 @csrf_exempt
 def debug_post(request):
@@ -260,30 +257,20 @@ def debug_post(request):
             'content_type': request.content_type,
         }
         
-        return HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=200
-        )
+        return json_response(response_data)
     
     elif request.method == 'POST':
-        logger.info(f"DEBUG POST request received")
-        logger.info(f"Content-Type: {request.content_type}")
-        logger.info(f"Request body: {request.body}")
-        logger.info(f"Request headers: {dict(request.headers)}")
+        log_request(request, 'DEBUG POST', level=logging.DEBUG)
         
+        summary = summarize_request(request)
         response_data = {
             'message': 'Debug POST received',
             'content_type': request.content_type,
-            'body': str(request.body),
-            'headers': dict(request.headers),
+            'body': summary['body'],
+            'headers': summary['headers'],
         }
         
-        return HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=200
-        )
+        return json_response(response_data)
 
 @csrf_exempt
 def post_detail(request, pk):
@@ -294,14 +281,10 @@ def post_detail(request, pk):
     try:
         post = Post.objects.get(pk=pk)
     except Post.DoesNotExist:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Post não encontrado'
-            }),
-            content_type='application/json',
-            status=404
-        )
+        return json_response({
+            'success': False,
+            'message': 'Post não encontrado'
+        }, status=404)
     
     # Verificar se o usuário é o dono do post (temporariamente desabilitado)
     # if post.user != request.user:
@@ -318,9 +301,32 @@ def post_detail(request, pk):
         try:
             # Verificar se é multipart/form-data (upload de arquivo)
             if request.content_type and 'multipart/form-data' in request.content_type:
-                title = request.POST.get('title')
-                content = request.POST.get('content')
-                image = request.FILES.get('image')
+                if exceeds_upload_limit(request):
+                    message, status_code = too_large_error()
+                    return json_response({
+                        'success': False,
+                        'message': message
+                    }, status=status_code)
+                # Handler próprio: limita o tamanho e valida a imagem enquanto ela chega
+                form_data, files = parse_multipart(request)
+                title = form_data.get('title')
+                content = form_data.get('content')
+                image = files.get('image')
+                
+                upload_error = getattr(request, 'upload_error', None)
+                if upload_error:
+                    message, status_code = upload_error
+                    return json_response({
+                        'success': False,
+                        'message': message
+                    }, status=status_code)
+                
+                if image and not uploads.is_available():
+                    logger.warning("Image storage not configured - skipping image upload")
+                    return json_response({
+                        'success': False,
+                        'message': 'Upload de imagens temporariamente indisponível.'
+                    }, status=400)
             else:
                 # Parse JSON manualmente
                 data = json.loads(request.body.decode('utf-8'))
@@ -332,24 +338,27 @@ def post_detail(request, pk):
             user = get_user_from_token(request)
             if not user:
                 logger.error("Failed to authenticate user from token")
-                return HttpResponse(
-                    json.dumps({'error': 'Token de autenticação inválido ou ausente'}),
-                    content_type='application/json',
-                    status=401
-                )
+                return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
             
             if title:
                 post.title = title
             if content:
                 post.content = content
             if image:
-                post.image = image
+                # A nova imagem substitui a atual quando o upload em segundo plano terminar
+                post.image_status = Post.IMAGE_PENDING
             
             # Atualizar o username para o do usuário autenticado
             post.username = user.username
             post.user = user
             
-            post.save()
+            with transaction.atomic():
+                # update_fields evita sobrescrever os contadores de likes/comentários
+                post.save(update_fields=[
+                    'title', 'content', 'image_status', 'username', 'user', 'updated_at'
+                ])
+                if image:
+                    attach_image(post, image)
             
             response_data = {
                 'success': True,
@@ -357,134 +366,184 @@ def post_detail(request, pk):
                 'data': {
                     'id': post.id,
                     'username': user.username,
-                    'created_datetime': post.created_datetime.isoformat(),
+                    'created_datetime': post.created_datetime,
                     'title': post.title,
                     'content': post.content,
-                    'image': request.build_absolute_uri(post.image.url) if post.image else None
+                    'image': post.image if post.image else None,
+                    'image_thumbnail': post.image_thumbnail,
+                    'image_webp': post.image_webp,
+                    'image_status': post.image_status
                 }
             }
             
-            return HttpResponse(
-                json.dumps(response_data),
-                content_type='application/json',
-                status=200
-            )
+            return json_response(response_data)
             
         except json.JSONDecodeError:
-            return HttpResponse(
-                json.dumps({
-                    'success': False,
-                    'message': 'JSON inválido'
-                }),
-                content_type='application/json',
-                status=400
-            )
+            return json_response({
+                'success': False,
+                'message': 'JSON inválido'
+            }, status=400)
         except Exception as e:
-            return HttpResponse(
-                json.dumps({
-                    'success': False,
-                    'message': str(e)
-                }),
-                content_type='application/json',
-                status=500
-            )
+            return json_response({
+                'success': False,
+                'message': str(e)
+            }, status=500)
     
     elif request.method == 'DELETE':
         post.delete()
-        return HttpResponse(
-            json.dumps({
-                'success': True,
-                'message': 'Post deletado com sucesso'
-            }),
-            content_type='application/json',
-            status=200
-        )
+        return json_response({
+            'success': True,
+            'message': 'Post deletado com sucesso'
+        })
+
+def toggle_post_like(post_id, user_id):
+    """
+    Toggle atômico: DELETE / INSERT ON CONFLICT + contador na mesma transação.
+    Retorna (liked, likes_count)
+    """
+    liked, likes_count = Like.objects.toggle(post_id, user_id)
+    # O toggle não passa pelos signals, então o cache é invalidado aqui
+    feed_cache.invalidate_post(post_id)
+    return liked, likes_count
 
 @csrf_exempt
-def toggle_like(request, pk):
+async def toggle_like(request, pk):
     """
     POST: Adiciona ou remove like de um post
     """
-    try:
-        post = Post.objects.get(pk=pk)
-    except Post.DoesNotExist:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Post não encontrado'
-            }),
-            content_type='application/json',
-            status=404
-        )
+    if not await Post.objects.filter(pk=pk).aexists():
+        return json_response({
+            'success': False,
+            'message': 'Post não encontrado'
+        }, status=404)
     
     # Autenticar usuário via token JWT
-    user = get_user_from_token(request)
+    user = await aget_user_from_token(request)
     if not user:
-        return HttpResponse(
-            json.dumps({'error': 'Token de autenticação inválido ou ausente'}),
-            content_type='application/json',
-            status=401
-        )
+        return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
     
     try:
-        # Verificar se o usuário já deu like
-        existing_like = Like.objects.filter(post=post, user=user).first()
-        
-        if existing_like:
-            # Remover like
-            existing_like.delete()
-            action = 'removed'
-        else:
-            # Adicionar like
-            Like.objects.create(post=post, user=user)
-            action = 'added'
+        liked, likes_count = await sync_to_async(toggle_post_like)(pk, user.pk)
+        action = 'added' if liked else 'removed'
         
         response_data = {
             'success': True,
             'message': f'Like {action} com sucesso',
             'data': {
                 'action': action,
-                'likes_count': post.likes_count,
-                'user_liked': action == 'added'
+                'likes_count': likes_count,
+                'user_liked': liked
             }
         }
         
-        return HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=200
-        )
+        return json_response(response_data)
         
     except Exception as e:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': str(e)
-            }),
-            content_type='application/json',
-            status=500
+        return json_response({
+            'success': False,
+            'message': str(e)
+        }, status=500)
+
+def get_posts_by_ids(ids, user=None):
+    """
+    Retorna (posts_data, ids_não_encontrados) na ordem de `ids`, em uma query:
+    contadores desnormalizados e user_liked anotado, como no feed
+    """
+    posts = Post.objects.with_user_liked(user).in_bulk(ids)
+    posts_data = [
+        dict(post_to_dict(posts[post_id]), user_liked=posts[post_id].user_liked)
+        for post_id in ids if post_id in posts
+    ]
+    return posts_data, [post_id for post_id in ids if post_id not in posts]
+
+@csrf_exempt
+async def post_batch(request):
+    """
+    GET: Posts pelos ids (?ids=1,2,3), na ordem pedida (público)
+    POST: Aplica em lote likes, unlikes e comentários em vários posts
+    ({"operations": [{"op": "like" | "unlike" | "comment", "post_id": 1, "content": "..."}]}).
+    Retorna um resultado por operação, na mesma ordem
+    """
+    if request.method == 'GET':
+        # Atualiza só os cards afetados, sem recarregar o feed
+        try:
+            ids = parse_ids(request)
+        except ValueError as e:
+            return json_response({'error': str(e)}, status=400)
+        
+        user = await aget_optional_user(request)
+        posts_data, missing = await sync_to_async(get_posts_by_ids)(ids, user)
+        
+        response = json_response({'data': posts_data, 'missing': missing})
+        patch_vary_headers(response, ['Authorization'])
+        return response
+    
+    if request.method != 'POST':
+        return json_response({'error': 'Método não permitido'}, status=405)
+    
+    user = await aget_user_from_token(request)
+    if not user:
+        return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
+    
+    try:
+        operations = json.loads(request.body.decode('utf-8')).get('operations')
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return json_response({'error': 'JSON inválido'}, status=400)
+    
+    if not isinstance(operations, list) or not operations:
+        return json_response({'error': 'Operations deve ser uma lista não vazia'}, status=400)
+    if len(operations) > batch.MAX_OPERATIONS:
+        return json_response(
+            {'error': f'Máximo de {batch.MAX_OPERATIONS} operações por lote'}, status=400
         )
+    
+    results = await sync_to_async(batch.apply_operations)(user, operations)
+    return json_response({'success': True, 'data': results})
+
+def create_comment(post, user, content):
+    # Criar comentário (o contador é atualizado na mesma transação)
+    with transaction.atomic():
+        comment = Comment.objects.create(
+            post=post,
+            user=user,
+            content=content
+        )
+    
+    # Criar menções se houver
+    create_mentions(post, content, user)
+    return comment
 
 @csrf_exempt
-def comment_list(request, pk):
+@acondition(etag_func=comments_etag)
+async def comment_list(request, pk):
     """
-    GET: Lista comentários de um post
+    GET: Lista comentários de um post, paginados por cursor (mais antigos primeiro)
     POST: Adiciona comentário a um post
     """
     try:
-        post = Post.objects.get(pk=pk)
+        post = await Post.objects.only('id').aget(pk=pk)
     except Post.DoesNotExist:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Post não encontrado'
-            }),
-            content_type='application/json',
-            status=404
-        )
+        return json_response({
+            'success': False,
+            'message': 'Post não encontrado'
+        }, status=404)
     
     if request.method == 'GET':
-        comments = post.comments.all()
+        # select_related/only: o username vem no mesmo SELECT, sem query por comentário
+        try:
+            limit = parse_limit(request)
+            comments, next_cursor = await apaginate(
+                post.comments.select_related('user').only(
+                    'id', 'post', 'content', 'created_at', 'updated_at', 'user__username'
+                ),
+                'created_at',
+                cursor=request.GET.get('cursor'),
+                limit=limit,
+                descending=False,
+            )
+        except ValueError as e:
+            return json_response({'error': str(e)}, status=400)
+        
         comments_data = []
         
         for comment in comments:
@@ -492,51 +551,32 @@ def comment_list(request, pk):
                 'id': comment.id,
                 'username': comment.user.username,
                 'content': comment.content,
-                'created_at': comment.created_at.isoformat(),
-                'updated_at': comment.updated_at.isoformat()
+                'created_at': comment.created_at,
+                'updated_at': comment.updated_at
             })
         
         response_data = {
             'success': True,
-            'data': comments_data
+            'data': comments_data,
+            'next': next_cursor
         }
         
-        return HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=200
-        )
+        return json_response(response_data)
     
     elif request.method == 'POST':
         # Autenticar usuário via token JWT
-        user = get_user_from_token(request)
+        user = await aget_user_from_token(request)
         if not user:
-            return HttpResponse(
-                json.dumps({'error': 'Token de autenticação inválido ou ausente'}),
-                content_type='application/json',
-                status=401
-            )
+            return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
         
         try:
             data = json.loads(request.body.decode('utf-8'))
             content = data.get('content')
             
             if not content:
-                return HttpResponse(
-                    json.dumps({'error': 'Content é obrigatório'}),
-                    content_type='application/json',
-                    status=400
-                )
-            
-            # Criar comentário
-            comment = Comment.objects.create(
-                post=post,
-                user=user,
-                content=content
-            )
+                return json_response({'error': 'Content é obrigatório'}, status=400)
             
-            # Criar menções se houver
-            create_mentions(post, content, user)
+            comment = await sync_to_async(create_comment)(post, user, content)
             
             response_data = {
                 'success': True,
@@ -545,32 +585,20 @@ def comment_list(request, pk):
                     'id': comment.id,
                     'username': user.username,
                     'content': comment.content,
-                    'created_at': comment.created_at.isoformat(),
-                    'updated_at': comment.updated_at.isoformat()
+                    'created_at': comment.created_at,
+                    'updated_at': comment.updated_at
                 }
             }
             
-            return HttpResponse(
-                json.dumps(response_data),
-                content_type='application/json',
-                status=201
-            )
+            return json_response(response_data, status=201)
             
         except json.JSONDecodeError:
-            return HttpResponse(
-                json.dumps({'error': 'JSON inválido'}),
-                content_type='application/json',
-                status=400
-            )
+            return json_response({'error': 'JSON inválido'}, status=400)
         except Exception as e:
-            return HttpResponse(
-                json.dumps({
-                    'success': False,
-                    'message': str(e)
-                }),
-                content_type='application/json',
-                status=500
-            )
+            return json_response({
+                'success': False,
+                'message': str(e)
+            }, status=500)
 
 @csrf_exempt
 def comment_detail(request, post_pk, comment_pk):
@@ -581,34 +609,22 @@ def comment_detail(request, post_pk, comment_pk):
     try:
         comment = Comment.objects.get(pk=comment_pk, post_id=post_pk)
     except Comment.DoesNotExist:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Comentário não encontrado'
-            }),
-            content_type='application/json',
-            status=404
-        )
+        return json_response({
+            'success': False,
+            'message': 'Comentário não encontrado'
+        }, status=404)
     
     # Autenticar usuário via token JWT
     user = get_user_from_token(request)
     if not user:
-        return HttpResponse(
-            json.dumps({'error': 'Token de autenticação inválido ou ausente'}),
-            content_type='application/json',
-            status=401
-        )
+        return json_response({'error': 'Token de autenticação inválido ou ausente'}, status=401)
     
     # Verificar se o usuário é o dono do comentário
     if comment.user != user:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Você não tem permissão para modificar este comentário'
-            }),
-            content_type='application/json',
-            status=403
-        )
+        return json_response({
+            'success': False,
+            'message': 'Você não tem permissão para modificar este comentário'
+        }, status=403)
     
     if request.method == 'PATCH':
         try:
@@ -629,77 +645,68 @@ def comment_detail(request, post_pk, comment_pk):
                     'id': comment.id,
                     'username': comment.user.username,
                     'content': comment.content,
-                    'created_at': comment.created_at.isoformat(),
-                    'updated_at': comment.updated_at.isoformat()
+                    'created_at': comment.created_at,
+                    'updated_at': comment.updated_at
                 }
             }
             
-            return HttpResponse(
-                json.dumps(response_data),
-                content_type='application/json',
-                status=200
-            )
+            return json_response(response_data)
             
         except json.JSONDecodeError:
-            return HttpResponse(
-                json.dumps({'error': 'JSON inválido'}),
-                content_type='application/json',
-                status=400
-            )
+            return json_response({'error': 'JSON inválido'}, status=400)
         except Exception as e:
-            return HttpResponse(
-                json.dumps({
-                    'success': False,
-                    'message': str(e)
-                }),
-                content_type='application/json',
-                status=500
-            )
+            return json_response({
+                'success': False,
+                'message': str(e)
+            }, status=500)
     
     elif request.method == 'DELETE':
         comment.delete()
-        return HttpResponse(
-            json.dumps({
-                'success': True,
-                'message': 'Comentário deletado com sucesso'
-            }),
-            content_type='application/json',
-            status=200
-        )
+        return json_response({
+            'success': True,
+            'message': 'Comentário deletado com sucesso'
+        })
 
-def mentions_list(request, pk):
+@acondition(etag_func=mentions_etag)
+async def mentions_list(request, pk):
     """
-    GET: Lista menções de um post
+    GET: Lista menções de um post, paginadas por cursor
     """
     try:
-        post = Post.objects.get(pk=pk)
+        post = await Post.objects.only('id').aget(pk=pk)
     except Post.DoesNotExist:
-        return HttpResponse(
-            json.dumps({
-                'success': False,
-                'message': 'Post não encontrado'
-            }),
-            content_type='application/json',
-            status=404
+        return json_response({
+            'success': False,
+            'message': 'Post não encontrado'
+        }, status=404)
+    
+    try:
+        limit = parse_limit(request)
+        mentions, next_cursor = await apaginate(
+            post.mentions.select_related('mentioned_user').only(
+                'id', 'post', 'created_at', 'mentioned_user__username'
+            ),
+            'created_at',
+            cursor=request.GET.get('cursor'),
+            limit=limit,
+            descending=False,
         )
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
     
-    mentions = post.mentions.all()
     mentions_data = []
     
     for mention in mentions:
         mentions_data.append({
             'id': mention.id,
             'mentioned_username': mention.mentioned_user.username,
-            'created_at': mention.created_at.isoformat()
+            'created_at': mention.created_at
         })
     
     response_data = {
         'success': True,
-        'data': mentions_data
+        'data': mentions_data,
+        'next': next_cursor
     }
     
-    return HttpResponse(
-        json.dumps(response_data),
-        content_type='application/json',
-        status=200
-    )
+    return json_response(response_data)
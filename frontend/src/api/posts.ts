@@ -18,6 +18,7 @@ const API_BASE_URL = getApiBaseUrl();
 // Tipos de resposta da API
 export interface PostsResponse {
   data: Post[];
+  next?: string | null;
   message?: string;
 }
 
@@ -26,9 +27,15 @@ export interface PostResponse {
   message?: string;
 }
 
+export interface PostsByIdsResponse {
+  data: Post[];
+  missing: number[];
+}
+
 export interface CommentsResponse {
   success: boolean;
   data: Comment[];
+  next?: string | null;
 }
 
 export interface MentionsResponse {
@@ -102,12 +109,60 @@ async function authenticatedRequest<T>(
   return apiRequest<T>(endpoint, finalOptions);
 }
 
+// O backend pagina as listas por cursor (?limit=&cursor=). O feed é lido
+// uma página por vez (o próximo cursor vem em `next`); os comentários de um
+// post seguem `next` até a última página para devolver a lista completa
+const FEED_PAGE_SIZE = 20;
+const PAGE_SIZE = 100;
+
+function feedEndpoint(cursor?: string | null): string {
+  const params = new URLSearchParams({ limit: String(FEED_PAGE_SIZE) });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return `/careers/?${params}`;
+}
+
+interface PaginatedResponse<T> {
+  data: T[];
+  next?: string | null;
+}
+
+async function fetchAllPages<T>(endpoint: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null | undefined = null;
+
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const page: PaginatedResponse<T> = await authenticatedRequest<
+      PaginatedResponse<T>
+    >(`${endpoint}?${params}`);
+    items.push(...(page.data || []));
+    cursor = page.next;
+  } while (cursor);
+
+  return items;
+}
+
 // API de posts client-side (para uso em componentes client)
 export const postsApi = {
-  // Buscar todos os posts
-  async getPosts(): Promise<Post[]> {
-    const response = await authenticatedRequest<PostsResponse>("/careers/");
-    return response.data || [];
+  // Buscar uma página do feed; `next` é o cursor da página seguinte
+  async getPosts(cursor?: string | null): Promise<PostsResponse> {
+    return authenticatedRequest<PostsResponse>(feedEndpoint(cursor));
+  },
+
+  // Buscar vários posts pelos ids (até 100), na ordem pedida, para atualizar
+  // cards específicos sem recarregar o feed. `missing` traz os ids excluídos
+  async getPostsByIds(ids: number[]): Promise<PostsByIdsResponse> {
+    if (ids.length === 0) {
+      return { data: [], missing: [] };
+    }
+    return authenticatedRequest<PostsByIdsResponse>(
+      `/careers/batch/?ids=${ids.join(",")}`
+    );
   },
 
   // Buscar um post específico
@@ -201,10 +256,9 @@ export const postsApi = {
 
   // Buscar comentários de um post
   async getComments(id: number): Promise<Comment[]> {
-    const response = await authenticatedRequest<CommentsResponse>(
-      `/careers/${id}/comments/`
-    );
-    return response.data || [];
+    // Paginados do mais antigo para o mais novo: sem seguir `next`, os
+    // comentários novos de posts com muitos comentários nunca apareceriam
+    return fetchAllPages<Comment>(`/careers/${id}/comments/`);
   },
 
   // Criar comentário em um post
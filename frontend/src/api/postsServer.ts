@@ -18,6 +18,7 @@ const API_BASE_URL = getApiBaseUrl();
 // Tipos de resposta da API
 export interface PostsResponse {
   data: Post[];
+  next?: string | null;
   message?: string;
 }
 
@@ -29,6 +30,7 @@ export interface PostResponse {
 export interface CommentsResponse {
   success: boolean;
   data: Comment[];
+  next?: string | null;
 }
 
 export interface MentionsResponse {
@@ -105,17 +107,54 @@ async function authenticatedRequest<T>(
   return apiRequest<T>(endpoint, finalOptions);
 }
 
+// O backend pagina as listas por cursor (?limit=&cursor=). O feed é lido
+// uma página por vez (o próximo cursor vem em `next`); os comentários de um
+// post seguem `next` até a última página para devolver a lista completa
+const FEED_PAGE_SIZE = 20;
+const PAGE_SIZE = 100;
+
+function feedEndpoint(cursor?: string | null): string {
+  const params = new URLSearchParams({ limit: String(FEED_PAGE_SIZE) });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return `/careers/?${params}`;
+}
+
+interface PaginatedResponse<T> {
+  data: T[];
+  next?: string | null;
+}
+
+async function fetchAllPages<T>(endpoint: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null | undefined = null;
+
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const page: PaginatedResponse<T> = await authenticatedRequest<
+      PaginatedResponse<T>
+    >(`${endpoint}?${params}`);
+    items.push(...(page.data || []));
+    cursor = page.next;
+  } while (cursor);
+
+  return items;
+}
+
 // API de posts server-side (para uso em server actions)
 export const postsApiServer = {
-  // Buscar todos os posts
-  async getPosts(): Promise<Post[]> {
+  // Buscar uma página do feed; `next` é o cursor da página seguinte
+  async getPosts(cursor?: string | null): Promise<PostsResponse> {
     try {
-      const response = await authenticatedRequest<PostsResponse>("/careers/");
-      return response.data || [];
+      return await authenticatedRequest<PostsResponse>(feedEndpoint(cursor));
     } catch (error) {
       console.error("Error fetching posts:", error);
-      // Fallback: retornar array vazio se houver erro de autenticação
-      return [];
+      // Fallback: retornar página vazia se houver erro de autenticação
+      return { data: [], next: null };
     }
   },
 
@@ -210,10 +249,9 @@ export const postsApiServer = {
 
   // Buscar comentários de um post
   async getComments(id: number): Promise<Comment[]> {
-    const response = await authenticatedRequest<CommentsResponse>(
-      `/careers/${id}/comments/`
-    );
-    return response.data || [];
+    // Paginados do mais antigo para o mais novo: sem seguir `next`, os
+    // comentários novos de posts com muitos comentários nunca apareceriam
+    return fetchAllPages<Comment>(`/careers/${id}/comments/`);
   },
 
   // Criar comentário em um post
@@ -37,14 +37,31 @@ async function authenticatedRequest<T>(
   return response.json();
 }
 
-// Função para buscar posts
-export async function getPosts(): Promise<Post[]> {
+// O feed é paginado por cursor: cada chamada devolve uma página e o cursor
+// da seguinte em `next` (null na última)
+const PAGE_SIZE = 20;
+
+export interface PostsPage {
+  data: Post[];
+  next: string | null;
+}
+
+// Função para buscar uma página de posts
+export async function getPosts(cursor?: string | null): Promise<PostsPage> {
   try {
-    const response = await authenticatedRequest<{ data: Post[] }>("/careers/");
-    return response.data || [];
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const page = await authenticatedRequest<{
+      data: Post[];
+      next?: string | null;
+    }>(`/careers/?${params}`);
+
+    return { data: page.data || [], next: page.next ?? null };
   } catch (error) {
     console.error("Error fetching posts:", error);
-    return [];
+    return { data: [], next: null };
   }
 }
 
@@ -14,8 +14,8 @@ export function DebugAuth() {
     setLoading(true);
     setError(null);
     try {
-      const postsData = await postsApi.getPosts();
-      setPosts(postsData);
+      const { data } = await postsApi.getPosts();
+      setPosts(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Erro desconhecido");
     } finally {
@@ -29,6 +29,7 @@ export function PostCard({ post }: PostCardProps) {
   // Estados para likes, comments e menções
   const [likesCount, setLikesCount] = useState(post.likes_count);
   const [userLiked, setUserLiked] = useState(post.user_liked);
+  const [commentsCount, setCommentsCount] = useState(post.comments_count);
   const [comments, setComments] = useState<Comment[]>([]);
   const [showComments, setShowComments] = useState(false);
   const [newComment, setNewComment] = useState("");
@@ -43,6 +44,11 @@ export function PostCard({ post }: PostCardProps) {
     }
   }, [post.created_datetime, isHydrated]);
 
+  // router.refresh() entrega um post novo: o contador acompanha
+  useEffect(() => {
+    setCommentsCount(post.comments_count);
+  }, [post.comments_count]);
+
   // Carregar comentários quando necessário
   useEffect(() => {
     if (showComments && comments.length === 0) {
@@ -62,6 +68,21 @@ export function PostCard({ post }: PostCardProps) {
     }
   };
 
+  // Rebusca só este post (/careers/batch/) para atualizar os contadores do
+  // card sem recarregar o feed inteiro
+  const refreshPost = async () => {
+    try {
+      const { data } = await postsApi.getPostsByIds([post.id]);
+      const fresh = data[0];
+      if (!fresh) return;
+      setLikesCount(fresh.likes_count);
+      setUserLiked(fresh.user_liked);
+      setCommentsCount(fresh.comments_count);
+    } catch (err) {
+      console.error("Erro ao atualizar post:", err);
+    }
+  };
+
   const handleToggleLike = async () => {
     if (!isHydrated) return;
 
@@ -84,6 +105,7 @@ export function PostCard({ post }: PostCardProps) {
       const newCommentData = await postsApi.createComment(post.id, commentData);
       setComments((prev) => [...prev, newCommentData]);
       setNewComment("");
+      await refreshPost();
     } catch (err) {
       console.error("Erro ao criar comentário:", err);
     } finally {
@@ -246,7 +268,7 @@ export function PostCard({ post }: PostCardProps) {
               className="flex items-center gap-2 px-3 py-2 rounded-lg text-gray-600 hover:text-blue-600 hover:bg-blue-50 transition-colors"
             >
               <MessageCircle size={18} />
-              <span className="text-sm font-medium">{post.comments_count}</span>
+              <span className="text-sm font-medium">{commentsCount}</span>
             </button>
           </div>
 
@@ -5,11 +5,11 @@ import { Suspense } from "react";
 
 async function PostsContainer() {
   try {
-    const posts = await getPosts();
+    const { data, next } = await getPosts();
 
     return (
       <Suspense fallback={<PostsListSkeleton />}>
-        <PostsList posts={posts} />
+        <PostsList initialPosts={data} initialNext={next} />
       </Suspense>
     );
   } catch (error) {
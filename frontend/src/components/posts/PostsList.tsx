@@ -1,6 +1,8 @@
 "use client";
 
+import { getPosts } from "@/app/actions/posts";
 import { Post } from "@/types";
+import { useEffect, useState } from "react";
 import { PostCard } from "./PostCard";
 
 // Componente de lista vazia
@@ -18,11 +20,46 @@ function PostsListEmpty() {
 }
 
 // Componente principal da lista de posts
+// Recebe a primeira página do servidor; as seguintes são buscadas pelo
+// cursor `next` quando o usuário pede mais
 interface PostsListProps {
-  posts: Post[];
+  initialPosts: Post[];
+  initialNext: string | null;
 }
 
-export function PostsList({ posts }: PostsListProps) {
+export function PostsList({ initialPosts, initialNext }: PostsListProps) {
+  const [posts, setPosts] = useState(initialPosts);
+  const [next, setNext] = useState(initialNext);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+
+  // router.refresh() (depois de criar, editar ou excluir) traz uma nova
+  // primeira página: recomeça a lista a partir dela
+  useEffect(() => {
+    setPosts(initialPosts);
+    setNext(initialNext);
+  }, [initialPosts, initialNext]);
+
+  const loadMore = async () => {
+    if (!next || isLoadingMore) return;
+
+    try {
+      setIsLoadingMore(true);
+      setError(null);
+      const page = await getPosts(next);
+      // Um post criado entre as páginas pode repetir um id já exibido
+      setPosts((prev) => {
+        const seen = new Set(prev.map((post) => post.id));
+        return [...prev, ...page.data.filter((post) => !seen.has(post.id))];
+      });
+      setNext(page.next);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Failed to load posts");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   if (posts.length === 0) {
     return <PostsListEmpty />;
   }
@@ -32,6 +69,20 @@ export function PostsList({ posts }: PostsListProps) {
       {posts.map((post) => (
         <PostCard key={post.id} post={post} />
       ))}
+
+      {error && <div className="text-center text-red-600">{error}</div>}
+
+      {next && (
+        <div className="text-center py-4">
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="px-4 py-2 rounded-lg bg-[#7695EC] text-white hover:bg-[#7695EC]/80 transition-colors disabled:opacity-50"
+          >
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
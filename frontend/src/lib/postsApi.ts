@@ -5,6 +5,7 @@ import api from "./axios";
 // Tipos de resposta da API
 export interface PostsResponse {
   data: Post[];
+  next?: string | null;
   message?: string;
 }
 
@@ -15,10 +16,12 @@ export interface PostResponse {
 
 // API para posts com autenticação automática
 export const postsApi = {
-  // Buscar todos os posts
-  async getPosts(): Promise<Post[]> {
-    const response = await api.get<PostsResponse>("/careers/");
-    return response.data.data || [];
+  // Buscar uma página do feed; `next` é o cursor da página seguinte
+  async getPosts(cursor?: string | null): Promise<PostsResponse> {
+    const response = await api.get<PostsResponse>("/careers/", {
+      params: { limit: 20, ...(cursor ? { cursor } : {}) },
+    });
+    return response.data;
   },
 
   // Buscar um post específico